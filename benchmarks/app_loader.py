@@ -0,0 +1,27 @@
+# Loads the app's logic (the pr_machine package) without drawing the page, for
+# the scripts in this directory. load_app() returns one namespace holding every
+# module's names, with the storage selected (and migrated) the way the top of
+# fitness_tracker_web.py selects it.
+import importlib
+import logging
+import os
+import sys
+import types
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "fitness_tracker_web.py")
+MODULES = ("catalogs", "diagnostics", "storage", "programs", "engine", "timers", "charts")
+
+def load_app():
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    app = types.ModuleType("pr_machine_app")
+    app.__file__ = APP
+    for name in MODULES:
+        module = importlib.import_module(f"pr_machine.{name}")
+        app.__dict__.update((key, value) for key, value in vars(module).items() if not key.startswith("__"))
+    app.storage.use(app.default_storage())
+    return app
@@ -0,0 +1,192 @@
+# Times the storage, achievement, prescription and dashboard paths against
+# synthetic histories (see synthetic_data.py) at growing log sizes, and saves
+# the numbers as JSON so later runs can be compared against them.
+#
+#   python benchmarks/run_benchmarks.py                        # 1k, 100k and 1M rows, files backend
+#   python benchmarks/run_benchmarks.py --sizes 1k,100k --storage files,sqlite
+#   python benchmarks/run_benchmarks.py --compare benchmarks/results/20251001-120000.json
+#
+# Each (backend, size) runs in its own process on a fresh data directory.
+# "cold" cases clear the in-process file cache first, "warm" ones don't.
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import date, datetime, timedelta
+
+from app_loader import load_app
+from synthetic_data import seed_storage
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+EXERCISE = "SSB Back Squat"
+WORKOUT_DAY = "Day 1: Leg Strength/Hypertrophy A"
+
+def parse_size(text):
+    return SIZES.get(text) or int(float(text.lower().replace("k", "e3").replace("m", "e6")))
+
+def dashboard(app):
+    # what the Progress Dashboard page loads on every rerun
+    app.load_achievements()
+    app.load_progress()
+    exercises = app.program_registry().exercises
+    app.load_1rms()
+    app.load_performance(exercises[0])
+    summary = app.performance_summary()
+    return [summary[ex]["rate"] if ex in summary else 0 for ex in exercises]
+
+def workout_row(app, i):
+    return {
+        "Date": datetime.now().strftime("%Y-%m-%d %H:%M"), "Type": "Workout", "Day": WORKOUT_DAY,
+        "Exercise/Note": EXERCISE, "Details": "3-4x6-10 @ 200-225 lbs, RPE 7-8", "Notes": f"{i % 4}/4 sets successful",
+        "Weight": None, "Calories": None, "1RM": None, "Sets Succeeded": i % 4, "Sets Attempted": 4, "RPE": 8.0,
+    }
+
+def cases(app):
+    cold = app.file_cache.clear
+    counter = iter(range(10**9))
+    return [
+        ("load_progress", "cold", cold, lambda: app.load_progress()),
+        ("load_progress", "warm", None, lambda: app.load_progress()),
+        ("load_progress (filter + 28 days)", "cold", cold, lambda: app.load_progress(EXERCISE, start=date.today() - timedelta(days=27))),
+        ("progress_page (exercise filter)", "cold", cold, lambda: app.progress_page(exercise=EXERCISE)),
+        ("progress_page (exercise filter)", "warm", None, lambda: app.progress_page(exercise=EXERCISE)),
+        ("dashboard", "cold", cold, lambda: dashboard(app)),
+        ("dashboard", "warm", None, lambda: dashboard(app)),
+        ("get_recovery_metrics", "cold", cold, app.get_recovery_metrics),
+        ("get_recovery_metrics", "warm", None, app.get_recovery_metrics),
+        ("update_prescription", "cold", cold, lambda: app.update_prescription(EXERCISE, None, None, WORKOUT_DAY, "Base")),
+        ("update_prescription", "warm", None, lambda: app.update_prescription(EXERCISE, None, None, WORKOUT_DAY, "Base")),
+        ("update_prescription (log set)", "warm", None, lambda: app.update_prescription(EXERCISE, True, 1, WORKOUT_DAY, "Base")),
+        ("check_achievements", "warm", None, app.check_achievements),
+        ("onerm_history (estimates + 90-day range)", "cold", cold, lambda: app.onerm_history(EXERCISE).estimated(date.today() - timedelta(days=89))),
+        ("onerm_history (estimates + 90-day range)", "warm", None, lambda: app.onerm_history(EXERCISE).estimated(date.today() - timedelta(days=89))),
+        ("save_log", "warm", None, lambda: app.save_log("Workout", workout_row(app, next(counter)))),
+        ("rebuild_recovery_state", "cold", cold, app.rebuild_recovery_state),
+        ("rebuild_achievement_state", "cold", cold, app.rebuild_achievement_state),
+    ]
+
+def measure(setup, func, repeat):
+    if setup:
+        setup()
+    func()  # warm-up: imports, lazily built summaries
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+def run_size(backend, rows, repeat, workdir, queue):
+    try:
+        os.chdir(workdir)
+        os.environ["PR_MACHINE_STORAGE"] = backend
+        os.environ["PR_MACHINE_DB"] = os.path.join(workdir, "pr_machine.db")
+        app = load_app()
+        started = time.perf_counter()
+        seed_storage(app, rows)
+        results = [{"storage": backend, "rows": rows, "case": "seed", "mode": "cold", "runs": [(time.perf_counter() - started) * 1000]}]
+        for name, mode, setup, func in cases(app):
+            # full rebuilds are slow at the top sizes; time those once
+            runs = measure(setup, func, 1 if name.startswith("rebuild") and rows >= 100_000 else repeat)
+            results.append({"storage": backend, "rows": rows, "case": name, "mode": mode, "runs": runs})
+            print(f"  {backend:>6} {rows:>9} {name + ' [' + mode + ']':<42} {statistics.median(runs):10.2f} ms", flush=True)
+        queue.put((results, None))
+    except Exception:
+        queue.put(([], traceback.format_exc()))
+
+def environment():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, cwd=os.path.dirname(RESULTS_DIR)).stdout.strip()
+        except OSError:
+            return ""
+    packages = {}
+    for name in ("pandas", "numpy", "pyarrow", "streamlit"):
+        try:
+            packages[name] = __import__(name).__version__
+        except ImportError:
+            packages[name] = None
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "packages": packages,
+    }
+
+def summarize(results):
+    for result in results:
+        runs = result.pop("runs") if "runs" in result else []
+        result.update(n=len(runs), min_ms=min(runs), median_ms=statistics.median(runs), max_ms=max(runs))
+    return results
+
+def compare(results, path):
+    with open(path, 'r') as f:
+        previous = {(r["storage"], r["rows"], r["case"], r["mode"]): r for r in json.load(f)["results"]}
+    print(f"\nvs {os.path.basename(path)} (median, new/old):")
+    for result in results:
+        old = previous.get((result["storage"], result["rows"], result["case"], result["mode"]))
+        if old and old["median_ms"]:
+            ratio = result["median_ms"] / old["median_ms"]
+            flag = "  slower" if ratio > 1.2 else "  faster" if ratio < 0.8 else ""
+            print(f"  {result['storage']:>6} {result['rows']:>9} {result['case'] + ' [' + result['mode'] + ']':<42} "
+                  f"{old['median_ms']:10.2f} -> {result['median_ms']:10.2f} ms  x{ratio:.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths against synthetic histories")
+    parser.add_argument("--sizes", default="1k,100k,1M", help="comma-separated log sizes, e.g. 1k,100k,1M or 5000")
+    parser.add_argument("--storage", default="files", help="comma-separated backends: files, sqlite")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", help="results file to compare against (default: the newest in benchmarks/results)")
+    parser.add_argument("--output", help="where to save results (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated data directories")
+    args = parser.parse_args()
+
+    started = datetime.now().isoformat(timespec="seconds")
+    previous = args.compare or max(glob.glob(os.path.join(RESULTS_DIR, "*.json")), default=None)
+    ctx = multiprocessing.get_context("spawn")
+    results, failed = [], False
+    for backend in args.storage.split(","):
+        for size in args.sizes.split(","):
+            rows = parse_size(size)
+            workdir = tempfile.mkdtemp(prefix=f"pr_machine_bench_{backend}_{size}_")
+            queue = ctx.Queue()
+            proc = ctx.Process(target=run_size, args=(backend, rows, args.repeat, workdir, queue))
+            proc.start()
+            size_results, error = queue.get()
+            proc.join()
+            if error:
+                print(error)
+                failed = True
+            results.extend(size_results)
+            if args.keep:
+                print(f"  data kept in {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {"started": started, "environment": environment(), "results": summarize(results)}
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nsaved {output}")
+    if previous and os.path.abspath(previous) != os.path.abspath(output):
+        compare(report["results"], previous)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
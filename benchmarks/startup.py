@@ -0,0 +1,89 @@
+# Times what a user waits for outside the hot paths run_benchmarks.py covers:
+# the first page of a fresh server process (cold start) and the rerun of each
+# page afterwards, driven through Streamlit's AppTest against a synthetic
+# history (see synthetic_data.py).
+#
+#   python benchmarks/startup.py                              # this checkout
+#   python benchmarks/startup.py --app /tmp/old/fitness_tracker_web.py --rows 10000
+#
+# --app times another checkout (e.g. a `git worktree` of an older commit); its
+# own benchmarks/synthetic_data.py seeds the data.
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fitness_tracker_web.py")
+PAGES = ["View Program", "Workout of the Day", "Progress Dashboard", "View Progress", "Recovery Metrics", "Create Program"]
+
+# Run in a fresh interpreter so nothing is imported or cached yet.
+COLD = """
+import logging, os, sys, time, json
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+at.run()
+assert not at.exception, at.exception
+print(json.dumps({"import streamlit": (imported - started) * 1000, "first run": (time.perf_counter() - imported) * 1000}))
+"""
+
+RERUNS = """
+import logging, os, sys, time, json, statistics
+logging.disable(logging.CRITICAL)
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+at.run()
+results = {}
+for page in json.loads(sys.argv[2]):
+    # selecting a page takes two runs before the sidebar settles
+    at.sidebar.selectbox[0].select(page).run()
+    at.sidebar.selectbox[0].select(page).run()
+    assert not at.exception, (page, at.exception)
+    runs = []
+    for _ in range(int(sys.argv[3])):
+        started = time.perf_counter()
+        at.run()
+        runs.append((time.perf_counter() - started) * 1000)
+    results[page] = statistics.median(runs)
+print(json.dumps(results))
+"""
+
+def run(code, app, workdir, *args):
+    result = subprocess.run([sys.executable, "-c", code, app, *args], cwd=workdir, capture_output=True, text=True, env=dict(os.environ, PYTHONWARNINGS="ignore"))
+    if result.returncode:
+        sys.exit(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the app's cold start and per-page reruns")
+    parser.add_argument("--app", default=APP, help="the fitness_tracker_web.py to time")
+    parser.add_argument("--rows", type=int, default=10_000, help="synthetic log rows to seed")
+    parser.add_argument("--cold", type=int, default=5, help="fresh processes to time the cold start over")
+    parser.add_argument("--repeat", type=int, default=5, help="reruns per page")
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+    workdir = tempfile.mkdtemp(prefix="pr_machine_startup_")
+    try:
+        if args.rows:
+            seed = os.path.join(os.path.dirname(app), "benchmarks", "synthetic_data.py")
+            subprocess.run([sys.executable, seed, "--rows", str(args.rows), "--dir", workdir], check=True, capture_output=True)
+        cold = [run(COLD, app, workdir) for _ in range(args.cold)]
+        print(f"{app} ({args.rows} rows)")
+        for key in cold[0]:
+            print(f"  {'cold: ' + key:<32} {statistics.median(c[key] for c in cold):10.1f} ms")
+        for page, ms in run(RERUNS, app, workdir, json.dumps(PAGES), str(args.repeat)).items():
+            print(f"  {'rerun: ' + page:<32} {ms:10.1f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Hammers the storage layer with concurrent writers and readers, the way
+# several Streamlit sessions (threads) and server processes would, then checks
+# that no write was lost and every read saw a parseable, consistent snapshot.
+#
+#   python benchmarks/stress_concurrent_writes.py --processes 4 --threads 4 --writes 50
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from datetime import date, timedelta
+
+from app_loader import load_app
+
+EXERCISES = ["Deadlifts", "Sprints", "Core (Planks, etc.)"]
+
+def writer(worker, writes, errors):
+    try:
+        app = load_app()
+        day = date(2025, 9, 1)
+        for i in range(writes):
+            logged = day + timedelta(days=i % 28)
+            app.save_log("Workout", {
+                "Date": f"{logged} 10:00", "Type": "Workout", "Day": "Day 1: Strength & Power",
+                "Exercise/Note": EXERCISES[i % len(EXERCISES)], "Details": "3x5, RPE 8",
+                "Notes": f'{worker} "set" {i}\nsecond line', "Weight": 150 + i % 50, "Calories": 2000 + i,
+            })
+            app.save_performance(EXERCISES[i % len(EXERCISES)], str(logged), i % 3 != 0, i)
+            app.save_1rm(f"Lift {worker}", i + 1)
+            if i % 10 == 0:
+                app.save_program(dict(app.DEFAULT_PROGRAM, name=f"Program {worker} #{i}"))
+    except Exception:
+        errors.append(traceback.format_exc())
+
+def reader(stop, errors, reads):
+    try:
+        app = load_app()
+        last = 0
+        while not stop.is_set():
+            rows = len(app.load_progress())
+            if rows < last:
+                raise AssertionError(f"log went backwards: {last} -> {rows}")
+            last = rows
+            app.load_1rms()
+            app.load_programs()
+            app.performance_summary()
+            app.recovery_trends()
+            reads[0] += 1
+    except Exception:
+        errors.append(traceback.format_exc())
+
+def run_worker(index, threads, writes, workdir, queue):
+    os.chdir(workdir)
+    errors, reads, stop = [], [0], threading.Event()
+    pool = [threading.Thread(target=writer, args=(f"p{index}t{t}", writes, errors)) for t in range(threads)]
+    readers = [threading.Thread(target=reader, args=(stop, errors, reads))]
+    for thread in pool + readers:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+    queue.put((errors, reads[0]))
+
+def verify(args, workers):
+    app = load_app()
+    expected_rows = len(workers) * args.writes
+    problems = []
+    log = app.load_progress()
+    if len(log) != expected_rows:
+        problems.append(f"log has {len(log)} rows, expected {expected_rows}")
+    per_exercise = {ex: sum(1 for i in range(args.writes) if EXERCISES[i % len(EXERCISES)] == ex) * len(workers) for ex in EXERCISES}
+    summary = app.performance_summary()
+    for ex, count in per_exercise.items():
+        if len(app.load_performance(ex)) != count:
+            problems.append(f"{ex}: {len(app.load_performance(ex))} performance entries, expected {count}")
+        if summary.get(ex, {}).get("total") != count:
+            problems.append(f"{ex}: summary total {summary.get(ex, {}).get('total')}, expected {count}")
+    onerms = app.load_1rms()
+    for worker in workers:
+        if onerms.get(f"Lift {worker}") != args.writes:
+            problems.append(f"1RM for {worker} is {onerms.get(f'Lift {worker}')}, expected {args.writes}")
+    names = {program["name"] for program in app.load_programs()}
+    missing = [f"Program {w} #{i}" for w in workers for i in range(0, args.writes, 10) if f"Program {w} #{i}" not in names]
+    if missing:
+        problems.append(f"{len(missing)} programs lost, e.g. {missing[0]}")
+    for name in ("achievement_state", "recovery_state"):
+        state = app.storage.load_state(name)
+        if state is None or state["rows"] != expected_rows:
+            problems.append(f"{name} counted {state and state['rows']} rows, expected {expected_rows}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent write stress test for the storage layer")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--storage", choices=["files", "sqlite"], default="files")
+    parser.add_argument("--dir", help="data directory (default: a fresh temporary one)")
+    args = parser.parse_args()
+    workdir = args.dir or tempfile.mkdtemp(prefix="pr_machine_stress_")
+    os.environ["PR_MACHINE_STORAGE"] = args.storage
+    os.environ["PR_MACHINE_DB"] = os.path.join(workdir, "pr_machine.db")
+    os.chdir(workdir)
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    started = time.perf_counter()
+    procs = [ctx.Process(target=run_worker, args=(i, args.threads, args.writes, workdir, queue)) for i in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    results = [queue.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - started
+
+    errors = [error for worker_errors, _ in results for error in worker_errors]
+    workers = [f"p{p}t{t}" for p in range(args.processes) for t in range(args.threads)]
+    problems = verify(args, workers)
+    writes = len(workers) * args.writes
+    print(f"{args.storage}: {len(workers)} writers x {args.writes} iterations in {elapsed:.1f}s "
+          f"({writes / elapsed:.0f} iterations/s), {sum(reads for _, reads in results)} reader passes, data in {workdir}")
+    for error in errors:
+        print(error)
+    for problem in problems:
+        print("FAIL:", problem)
+    if errors or problems:
+        sys.exit(1)
+    print("OK: no lost or torn writes")
+
+if __name__ == "__main__":
+    main()
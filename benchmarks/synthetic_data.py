@@ -0,0 +1,186 @@
+# Synthetic training histories for the benchmarks. Lifters run the built-in
+# programs back to back (with a deload week in between) and log what the app
+# logs: one Workout row per exercise from the Workout of the Day page, an
+# "Other" row from Recovery Metrics on most days, and every set in the
+# performance store.
+#
+# Small histories are one lifter over a few months. Past HISTORY_YEARS the
+# extra rows come from more lifters sharing the log (a gym on one install),
+# so dates, monthly partitions and recent-window queries stay realistic.
+#
+#   python benchmarks/synthetic_data.py --rows 100000 --dir /tmp/pr_machine_100k
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from app_loader import load_app
+
+HISTORY_YEARS = 3
+DELOAD_DAYS = 7
+# Log rows per lifter per day, measured over a few program cycles; used to
+# size the history so it ends close to `end`.
+ROWS_PER_LIFTER_DAY = 2.3
+SKIP_SESSION = 0.1
+LOG_RECOVERY = 0.6
+PHASE_SUCCESS = {"Base": 0.85, "Intensity": 0.78, "Peaking": 0.7}
+SEED_CHUNK_ROWS = 50_000
+
+class Lifter:
+    def __init__(self, app, index, start, seed):
+        self.app = app
+        self.rng = random.Random(seed * 100_003 + index)
+        self.programs = [app.DEFAULT_PROGRAM, app.BJJ_PROGRAM][index % 2:] + [app.DEFAULT_PROGRAM, app.BJJ_PROGRAM][:index % 2]
+        self.skill = self.rng.uniform(-0.08, 0.08)
+        self.body_weight = self.rng.uniform(140, 230)
+        self.onerms = {}
+        self.cycle = 0
+        self._start_run(start + timedelta(days=self.rng.randrange(7)))
+
+    def _start_run(self, start):
+        self.schedule = self.app.ProgramSchedule(self.programs[self.cycle % len(self.programs)], start)
+        self.cycle += 1
+
+    def onerm(self, exercise):
+        if exercise not in self.onerms:
+            self.onerms[exercise] = float(round(self.rng.uniform(95, 405) / 5) * 5)
+        return self.onerms[exercise]
+
+    def day(self, day):
+        if day > self.schedule.end + timedelta(days=DELOAD_DAYS):
+            self._start_run(day)
+        rng, rows = self.rng, []
+        workout_day, _, phase = self.schedule.lookup(day)
+        if workout_day and rng.random() >= SKIP_SESSION:
+            program = self.schedule.program
+            logged = datetime(day.year, day.month, day.day, rng.randrange(6, 20), rng.randrange(60))
+            for exercise in program["days"][workout_day]["exercises"]:
+                prescription = program["prescriptions"].get(workout_day, {}).get(phase, {}).get(exercise, {})
+                if "duration" in prescription:
+                    num_sets, onerm = 1, 0
+                else:
+                    num_sets = int(self.app.parse_range(prescription.get("sets", "3")).high)
+                    onerm = self.onerm(exercise) if prescription.get("percent_1rm", (0, 0)) != (0, 0) else 0
+                results = [rng.random() < PHASE_SUCCESS.get(phase, 0.8) + self.skill for _ in range(num_sets)]
+                succeeded = sum(results)
+                rows.append(({
+                    "Date": logged.strftime("%Y-%m-%d %H:%M"),
+                    "Type": "Workout",
+                    "Day": workout_day,
+                    "Exercise/Note": exercise,
+                    "Details": self.app.format_prescription(prescription, exercise, onerm),
+                    "Notes": f"{succeeded}/{num_sets} sets successful" + (f" 1RM: {onerm}" if onerm > 0 else ""),
+                    "Weight": None,
+                    "Calories": None,
+                    "1RM": onerm if onerm > 0 else None,
+                    "Sets Succeeded": succeeded,
+                    "Sets Attempted": num_sets,
+                    "RPE": self.app.rpe_ceiling(prescription.get("rpe", "")),
+                }, exercise, [{"date": day.isoformat(), "success": ok, "set": i + 1} for i, ok in enumerate(results)]))
+                if onerm and succeeded == num_sets and rng.random() < 0.3:
+                    self.onerms[exercise] = onerm + 5
+                logged += timedelta(minutes=rng.randrange(8, 20))
+        if rng.random() < LOG_RECOVERY:
+            self.body_weight += rng.gauss(0, 0.6)
+            weight, calories = round(self.body_weight, 1), round(rng.gauss(2600, 350))
+            rows.append(({
+                "Date": f"{day} {rng.randrange(6, 23):02d}:{rng.randrange(60):02d}",
+                "Type": "Other",
+                "Day": "",
+                "Exercise/Note": f"Weight: {weight}, Nutrition: {calories}",
+                "Details": "",
+                "Notes": "",
+                "Weight": float(weight),
+                "Calories": float(calories),
+                "1RM": None,
+                "Sets Succeeded": None,
+                "Sets Attempted": None,
+                "RPE": None,
+            }, None, []))
+        return rows
+
+class SyntheticHistory:
+    # Iterates day by day, yielding [(log row, exercise, performance entries)]
+    # in logging order; stops after exactly `rows` log rows.
+    def __init__(self, app, rows, end=None, years=HISTORY_YEARS, seed=0):
+        self.app = app
+        self.rows = rows
+        self.end = end or date.today()
+        self.days = min(years * 365, max(28, math.ceil(rows / ROWS_PER_LIFTER_DAY)))
+        self.start = self.end - timedelta(days=self.days - 1)
+        self.lifters = [Lifter(app, i, self.start, seed) for i in range(max(1, math.ceil(rows / (ROWS_PER_LIFTER_DAY * self.days))))]
+
+    @property
+    def onerms(self):
+        # the 1RM store is per athlete; keep the first lifter's numbers
+        return self.lifters[0].onerms
+
+    def __iter__(self):
+        emitted, day = 0, self.start
+        while emitted < self.rows:
+            rows = sorted((row for lifter in self.lifters for row in lifter.day(day)), key=lambda row: row[0]["Date"])
+            rows = rows[:self.rows - emitted]
+            emitted += len(rows)
+            if rows:
+                yield rows
+            day += timedelta(days=1)
+
+def seed_storage(app, rows, end=None, years=HISTORY_YEARS, seed=0):
+    # Bulk-writes a history through the storage layer (the per-row save_log
+    # path would take hours at a million rows), then builds the derived state
+    # the app would have built along the way.
+    history = SyntheticHistory(app, rows, end, years, seed)
+    pending, performance = [], defaultdict(list)
+
+    def flush():
+        if pending:
+            app.storage.append_log(pending)
+            del pending[:]
+        for exercise, entries in performance.items():
+            app.storage.append_performance(exercise, entries)
+        performance.clear()
+
+    for day_rows in history:
+        for row, exercise, entries in day_rows:
+            pending.append(row)
+            if entries:
+                performance[exercise].extend(entries)
+        if len(pending) >= SEED_CHUNK_ROWS:
+            flush()
+    flush()
+    for exercise, onerm in history.onerms.items():
+        app.storage.save_1rm(exercise, onerm, f"{history.end} 00:00")
+    app.file_cache.clear()
+    if hasattr(app.storage, "compact_log"):
+        app.storage.compact_log()
+    app.rebuild_recovery_state()
+    app.rebuild_achievement_state()
+    app.check_achievements()
+    app.performance_summary()
+    return history
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic training history into a fresh data directory")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--years", type=int, default=HISTORY_YEARS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--storage", choices=["files", "sqlite"], default="files")
+    parser.add_argument("--dir", help="data directory (default: a fresh temporary one)")
+    args = parser.parse_args()
+    workdir = os.path.abspath(args.dir or tempfile.mkdtemp(prefix="pr_machine_synthetic_"))
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    os.environ["PR_MACHINE_STORAGE"] = args.storage
+    os.environ["PR_MACHINE_DB"] = os.path.join(workdir, "pr_machine.db")
+    app = load_app()
+    started = time.perf_counter()
+    history = seed_storage(app, args.rows, years=args.years, seed=args.seed)
+    print(f"{args.storage}: {args.rows} rows for {len(history.lifters)} lifter(s), {history.start} to {history.end}, "
+          f"in {time.perf_counter() - started:.1f}s; data in {workdir}")
+
+if __name__ == "__main__":
+    main()
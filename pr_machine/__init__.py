@@ -0,0 +1,2 @@
+# The app's logic, split out of fitness_tracker_web.py so it is imported once
+# per process instead of re-executed on every Streamlit rerun.
@@ -0,0 +1,300 @@
+# Static catalogs: the built-in programs, warm-ups, quotes, achievements and
+# the exercise library. Plain data built once per process on first import.
+import re
+
+QUOTES = [
+    "Strength is Earned, Not Given",
+    "Lift Heavy, Live Bold",
+    "Push Through, Power Up",
+    "No Excuses, Just Results",
+    "Grind Now, Glory Later",
+    "Dominate the Bar, Conquer the Mats",
+    "Grind Hard, Win Easy",
+    "Power Through, PR Awaits"
+]
+
+WARM_UPS = {
+    "Strength": [
+        {"name": "Leg Swings", "description": "2x10/leg, swing leg forward-backward to improve hip mobility for squats and deadlifts. Keep core braced."},
+        {"name": "Arm Circles", "description": "2x10/arm, forward and backward, to warm up shoulders for pull-ups or cleans. Controlled motion."},
+        {"name": "Bodyweight Squats", "description": "2x15, slow tempo to activate quads, glutes, hamstrings. Focus on depth and form."},
+        {"name": "Dynamic Hamstring Stretch", "description": "2x10/leg, lunge forward and straighten leg to stretch hamstrings. Preps for deadlifts."},
+        {"name": "Scapular Push-Ups", "description": "2x12, on hands and knees, retract/protract shoulders to prime upper back for pulls."}
+    ],
+    "Conditioning": [
+        {"name": "Shrimping", "description": "2x10/side, BJJ-specific hip escape movement to warm up hips and core for sprints or ropes."},
+        {"name": "High Knees", "description": "2x20 sec, fast-paced to elevate heart rate and prep for conditioning. Keep arms pumping."},
+        {"name": "Butt Kicks", "description": "2x20 sec, jog while kicking heels to glutes to warm up hamstrings for sprints."},
+        {"name": "Lateral Lunges", "description": "2x10/side, step side-to-side to activate hips and adductors for agility drills."},
+        {"name": "Mountain Climbers", "description": "2x20 sec, fast-paced to warm up core and shoulders for conditioning intensity."}
+    ],
+    "Rest": [
+        {"name": "Cat-Cow Stretch", "description": "2x10, flow between arched and rounded spine to improve spinal mobility and recovery."},
+        {"name": "Foam Rolling", "description": "5 min, target quads, hamstrings, or back to release tightness. Slow, controlled pressure."},
+        {"name": "Child’s Pose", "description": "2x30 sec, stretch hips and lower back for recovery. Breathe deeply."},
+        {"name": "Seated Forward Fold", "description": "2x30 sec, stretch hamstrings and lower back. Keep spine long, avoid rounding."},
+        {"name": "Neck Rolls", "description": "2x10/side, gentle circles to release neck tension. Move slowly to avoid strain."}
+    ]
+}
+
+# Achievements are evaluated from a running state that is updated one log row
+# at a time: "counts" achievements unlock once their row predicate has matched
+# "target" rows, the others check a "condition" against the state and 1RMs.
+def _isin(value, options):
+    return value in options if isinstance(value, str) else value.isin(options)
+
+def _contains(value, text):
+    return text in value if isinstance(value, str) else value.str.contains(text, regex=False)
+
+def _contains_any(value, texts):
+    return any(text in value for text in texts) if isinstance(value, str) else value.str.contains("|".join(map(re.escape, texts)))
+
+# "counts" predicates take a row of text fields, or a frame of text columns when
+# the state is rebuilt, so they use the helpers above and & instead of and.
+ACHIEVEMENTS = [
+    {"name": "Iron Novice", "emoji": "🏅", "counts": lambda row: row["Type"] == "Workout", "target": 10, "description": "Log 10 workouts"},
+    {"name": "Grip Titan", "emoji": "💪", "counts": lambda row: _isin(row["Exercise/Note"], ["Deadlifts", "Farmer’s Carry", "Weighted Pull-Ups"]) & _contains(row["Notes"], "Success"), "target": 50, "description": "50 successful grip exercise sets"},
+    {"name": "Strength Beast", "emoji": "🏋️‍♂️", "condition": lambda state, onerms: any(new > old for ex, new in onerms.items() for note, old in state["min_1rm"].items() if ex in note), "description": "Hit a 1RM PR"},
+    {"name": "Sprint King", "emoji": "🏃", "counts": lambda row: _isin(row["Exercise/Note"], ["Sprints", "Sprint Drills"]) & _contains(row["Notes"], "Success"), "target": 50, "description": "50 successful sprint/conditioning sets"},
+    {"name": "Recovery Pro", "emoji": "🥗", "counts": lambda row: row["Type"] == "Other", "target": 7, "description": "7 consecutive recovery logs"},
+    {"name": "Consistency Champ", "emoji": "🔥", "condition": lambda state, onerms: state["streak"]["best"] >= 5, "description": "Log workouts 5 days in a row"},
+    {"name": "BJJ Grinder", "emoji": "🥋", "counts": lambda row: _isin(row["Day"], ["Day 1: Strength & Power", "Day 2: Conditioning & Core", "Day 3: Strength & Explosive Power"]) & _contains(row["Notes"], "Success"), "target": 20, "description": "20 BJJ program sets"},
+    {"name": "Power Surge", "emoji": "⚡", "counts": lambda row: _contains(row["Notes"], "Success") & _contains_any(row["Details"], ["RPE 8", "RPE 8-9", "RPE 9"]), "target": 10, "description": "10 successful RPE 8+ sets"}
+]
+
+DEFAULT_PROGRAM = {
+    "name": "12-Week Strength & Running",
+    "duration_weeks": 12,
+    "description": "Weeks 1-4 Base, 5-8 Intensity, 9-12 Peaking. 4 days/week, 60-90 min. Focus: squats, 5k, sprints.",
+    "days": {
+        "Day 1: Leg Strength/Hypertrophy A": {
+            "description": "Build lower body strength with compound lifts. Warm up 5-10 min, rest 2-3 min.",
+            "exercises": ["SSB Back Squat", "Leg Press", "Bulgarian Split Squats", "Lying Leg Curls", "Calf Raises"],
+            "schedule": [0]
+        },
+        "Day 2: Running/Endurance": {
+            "description": "Develop aerobic capacity for 5k. Warm up 5 min, RPE 6-7.",
+            "exercises": ["Walk/Run Intervals", "Core (Planks, etc.)"],
+            "schedule": [1]
+        },
+        "Day 3: Leg Strength/Hypertrophy B": {
+            "description": "Focus on posterior chain/unilateral lifts. Warm up 5-10 min, rest 2-3 min.",
+            "exercises": ["Hack Squat", "Romanian Deadlifts", "Step-Ups", "Glute-Ham Raises", "Seated Calf Raises"],
+            "schedule": [3]
+        },
+        "Day 4: Speed/Plyo": {
+            "description": "Build explosive power/speed. Warm up 10-15 min, rest 60-90s.",
+            "exercises": ["Sprint Drills", "Box Jumps", "Long Jumps", "Bounding", "Sled Pushes"],
+            "schedule": [4]
+        }
+    },
+    "prescriptions": {
+        "Day 1: Leg Strength/Hypertrophy A": {
+            "Base": {
+                "SSB Back Squat": {"sets": "3-4", "reps": "6-10", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 120},
+                "Leg Press": {"sets": "3", "reps": "10-12", "percent_1rm": (0.65, 0.75), "rpe": "8", "rest": 90},
+                "Bulgarian Split Squats": {"sets": "3", "reps": "8-10/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Lying Leg Curls": {"sets": "3", "reps": "12-15", "percent_1rm": (0.65, 0.75), "rpe": "8", "rest": 60},
+                "Calf Raises": {"sets": "3", "reps": "15-20", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 60}
+            },
+            "Intensity": {
+                "SSB Back Squat": {"sets": "3", "reps": "4-8", "percent_1rm": (0.75, 0.85), "rpe": "7-8", "rest": 120},
+                "Leg Press": {"sets": "3", "reps": "8-10", "percent_1rm": (0.75, 0.85), "rpe": "8", "rest": 90},
+                "Bulgarian Split Squats": {"sets": "3", "reps": "8-10/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Lying Leg Curls": {"sets": "3", "reps": "10-12", "percent_1rm": (0.75, 0.85), "rpe": "8", "rest": 60},
+                "Calf Raises": {"sets": "3", "reps": "12-15", "percent_1rm": (0.75, 0.85), "rpe": "7-8", "rest": 60}
+            },
+            "Peaking": {
+                "SSB Back Squat": {"sets": "2-3", "reps": "3-6", "percent_1rm": (0.85, 0.95), "rpe": "7-8", "rest": 120},
+                "Leg Press": {"sets": "2-3", "reps": "6-8", "percent_1rm": (0.85, 0.95), "rpe": "8", "rest": 90},
+                "Bulgarian Split Squats": {"sets": "3", "reps": "6-8/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Lying Leg Curls": {"sets": "2-3", "reps": "8-10", "percent_1rm": (0.85, 0.95), "rpe": "8", "rest": 60},
+                "Calf Raises": {"sets": "2-3", "reps": "10-12", "percent_1rm": (0.85, 0.95), "rpe": "7-8", "rest": 60}
+            }
+        },
+        "Day 2: Running/Endurance": {
+            "Base": {
+                "Walk/Run Intervals": {"duration": "30-40 min", "distance": "3-5 km", "pace": "6-7 min/km", "rpe": "6-7", "rest": 60},
+                "Core (Planks, etc.)": {"sets": "3", "reps": "30-60 sec", "percent_1rm": (0, 0), "rpe": "6-7", "rest": 60}
+            },
+            "Intensity": {
+                "Walk/Run Intervals": {"duration": "40-50 min", "distance": "5-8 km", "pace": "5.5-6.5 min/km", "rpe": "6-7", "rest": 60},
+                "Core (Planks, etc.)": {"sets": "3", "reps": "45-60 sec", "percent_1rm": (0, 0), "rpe": "6-7", "rest": 60}
+            },
+            "Peaking": {
+                "Walk/Run Intervals": {"duration": "50-60 min", "distance": "8-10 km, aim 5k in 25 min", "pace": "~5 min/km", "rpe": "6-7", "rest": 60},
+                "Core (Planks, etc.)": {"sets": "3", "reps": "60 sec", "percent_1rm": (0, 0), "rpe": "6-7", "rest": 60}
+            }
+        },
+        "Day 3: Leg Strength/Hypertrophy B": {
+            "Base": {
+                "Hack Squat": {"sets": "3-4", "reps": "8-12", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 120},
+                "Romanian Deadlifts": {"sets": "3", "reps": "8-10", "percent_1rm": (0.65, 0.75), "rpe": "8", "rest": 90},
+                "Step-Ups": {"sets": "3", "reps": "10/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Glute-Ham Raises": {"sets": "3", "reps": "6-8", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Seated Calf Raises": {"sets": "3", "reps": "12-15", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 60}
+            },
+            "Intensity": {
+                "Hack Squat": {"sets": "3", "reps": "6-10", "percent_1rm": (0.75, 0.85), "rpe": "7-8", "rest": 120},
+                "Romanian Deadlifts": {"sets": "3", "reps": "6-8", "percent_1rm": (0.75, 0.85), "rpe": "8", "rest": 90},
+                "Step-Ups": {"sets": "3", "reps": "8-10/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Glute-Ham Raises": {"sets": "3", "reps": "6-8", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Seated Calf Raises": {"sets": "3", "reps": "10-12", "percent_1rm": (0.75, 0.85), "rpe": "7-8", "rest": 60}
+            },
+            "Peaking": {
+                "Hack Squat": {"sets": "2-3", "reps": "4-8", "percent_1rm": (0.85, 0.95), "rpe": "7-8", "rest": 120},
+                "Romanian Deadlifts": {"sets": "2-3", "reps": "4-6", "percent_1rm": (0.85, 0.95), "rpe": "8", "rest": 90},
+                "Step-Ups": {"sets": "2-3", "reps": "6-8/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Glute-Ham Raises": {"sets": "2-3", "reps": "6-8", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Seated Calf Raises": {"sets": "2-3", "reps": "8-10", "percent_1rm": (0.85, 0.95), "rpe": "7-8", "rest": 60}
+            }
+        },
+        "Day 4: Speed/Plyo": {
+            "Base": {
+                "Sprint Drills": {"sets": "4-6", "reps": "50-100m", "effort": "80%", "rpe": "7-8", "rest": 90},
+                "Box Jumps": {"sets": "3-4", "reps": "4-6", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Long Jumps": {"sets": "3", "reps": "4-6", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Bounding": {"sets": "3", "reps": "20-30m", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Sled Pushes": {"sets": "3-4", "reps": "20-30m", "percent_1rm": (0.5, 0.75), "rpe": "7-8", "rest": 90}
+            },
+            "Intensity": {
+                "Sprint Drills": {"sets": "6-8", "reps": "50-100m", "effort": "85%", "rpe": "7-8", "rest": 90},
+                "Box Jumps": {"sets": "3", "reps": "4-6", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Long Jumps": {"sets": "3", "reps": "4-6", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Bounding": {"sets": "3", "reps": "25-35m", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Sled Pushes": {"sets": "3-4", "reps": "20-30m", "percent_1rm": (0.75, 1.0), "rpe": "7-8", "rest": 90}
+            },
+            "Peaking": {
+                "Sprint Drills": {"sets": "8", "reps": "50-100m", "effort": "near-max", "rpe": "7-8", "rest": 90},
+                "Box Jumps": {"sets": "3", "reps": "3-5", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Long Jumps": {"sets": "3", "reps": "3-5", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Bounding": {"sets": "3", "reps": "30-40m", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 90},
+                "Sled Pushes": {"sets": "3-4", "reps": "20-30m", "percent_1rm": (1.0, 1.0), "rpe": "7-8", "rest": 90}
+            }
+        }
+    }
+}
+
+BJJ_PROGRAM = {
+    "name": "8-Week BJJ Strength & Conditioning",
+    "duration_weeks": 8,
+    "description": "Build strength, power, and conditioning for BJJ. Weeks 1-3 Base, 4-6 Intensity, 7-8 Peaking. 3 days/week, 60-90 min.",
+    "days": {
+        "Day 1: Strength & Power": {
+            "description": "Compound lifts for grip, pulling, lower body strength. Warm up 5-10 min, rest 2-3 min for lifts.",
+            "exercises": ["Deadlifts", "Weighted Pull-Ups", "Farmer’s Carry", "Hanging Leg Raises"],
+            "schedule": [0]
+        },
+        "Day 2: Conditioning & Core": {
+            "description": "High-intensity conditioning to mimic BJJ anaerobic demands, plus core work. Warm up 5 min, rest 60-90s.",
+            "exercises": ["Sprints", "Battle Ropes", "Plank Variations"],
+            "schedule": [2]
+        },
+        "Day 3: Strength & Explosive Power": {
+            "description": "Build explosive power and strength for takedowns and scrambles. Warm up 10 min, rest 2-3 min for lifts.",
+            "exercises": ["Power Cleans", "Sled Pushes", "Bulgarian Split Squats", "Russian Twists"],
+            "schedule": [4]
+        }
+    },
+    "prescriptions": {
+        "Day 1: Strength & Power": {
+            "Base": {
+                "Deadlifts": {"sets": "3-4", "reps": "6-8", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 120},
+                "Weighted Pull-Ups": {"sets": "3", "reps": "8-10", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 90},
+                "Farmer’s Carry": {"sets": "3", "reps": "30-45 sec", "percent_1rm": (0.5, 0.6), "rpe": "7-8", "rest": 60},
+                "Hanging Leg Raises": {"sets": "3", "reps": "12-15", "percent_1rm": (0, 0), "rpe": "6-7", "rest": 60}
+            },
+            "Intensity": {
+                "Deadlifts": {"sets": "3", "reps": "4-6", "percent_1rm": (0.75, 0.85), "rpe": "8", "rest": 120},
+                "Weighted Pull-Ups": {"sets": "3", "reps": "6-8", "percent_1rm": (0.75, 0.85), "rpe": "8", "rest": 90},
+                "Farmer’s Carry": {"sets": "3", "reps": "45-60 sec", "percent_1rm": (0.6, 0.7), "rpe": "8", "rest": 60},
+                "Hanging Leg Raises": {"sets": "3", "reps": "15-20", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60}
+            },
+            "Peaking": {
+                "Deadlifts": {"sets": "2-3", "reps": "3-5", "percent_1rm": (0.85, 0.95), "rpe": "8-9", "rest": 150},
+                "Weighted Pull-Ups": {"sets": "2-3", "reps": "5-7", "percent_1rm": (0.85, 0.95), "rpe": "8-9", "rest": 90},
+                "Farmer’s Carry": {"sets": "3", "reps": "60 sec", "percent_1rm": (0.7, 0.8), "rpe": "8-9", "rest": 60},
+                "Hanging Leg Raises": {"sets": "3", "reps": "20", "percent_1rm": (0, 0), "rpe": "8", "rest": 60}
+            }
+        },
+        "Day 2: Conditioning & Core": {
+            "Base": {
+                "Sprints": {"sets": "6", "reps": "30 sec", "effort": "80%", "rpe": "7-8", "rest": 60},
+                "Battle Ropes": {"sets": "4", "reps": "30 sec", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Plank Variations": {"sets": "3", "reps": "30-45 sec", "percent_1rm": (0, 0), "rpe": "6-7", "rest": 60}
+            },
+            "Intensity": {
+                "Sprints": {"sets": "8", "reps": "30 sec", "effort": "85%", "rpe": "8", "rest": 60},
+                "Battle Ropes": {"sets": "4", "reps": "45 sec", "percent_1rm": (0, 0), "rpe": "8", "rest": 60},
+                "Plank Variations": {"sets": "3", "reps": "45-60 sec", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60}
+            },
+            "Peaking": {
+                "Sprints": {"sets": "10", "reps": "30 sec", "effort": "90%", "rpe": "8-9", "rest": 60},
+                "Battle Ropes": {"sets": "4", "reps": "60 sec", "percent_1rm": (0, 0), "rpe": "8-9", "rest": 60},
+                "Plank Variations": {"sets": "3", "reps": "60 sec", "percent_1rm": (0, 0), "rpe": "8", "rest": 60}
+            }
+        },
+        "Day 3: Strength & Explosive Power": {
+            "Base": {
+                "Power Cleans": {"sets": "3-4", "reps": "5-7", "percent_1rm": (0.65, 0.75), "rpe": "7-8", "rest": 120},
+                "Sled Pushes": {"sets": "4", "reps": "20-30m", "percent_1rm": (0.5, 0.75), "rpe": "7-8", "rest": 90},
+                "Bulgarian Split Squats": {"sets": "3", "reps": "8-10/leg", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60},
+                "Russian Twists": {"sets": "3", "reps": "15-20/side", "percent_1rm": (0, 0), "rpe": "6-7", "rest": 60}
+            },
+            "Intensity": {
+                "Power Cleans": {"sets": "3", "reps": "4-6", "percent_1rm": (0.75, 0.85), "rpe": "8", "rest": 120},
+                "Sled Pushes": {"sets": "4", "reps": "30-40m", "percent_1rm": (0.75, 1.0), "rpe": "8", "rest": 90},
+                "Bulgarian Split Squats": {"sets": "3", "reps": "6-8/leg", "percent_1rm": (0, 0), "rpe": "8", "rest": 60},
+                "Russian Twists": {"sets": "3", "reps": "20-25/side", "percent_1rm": (0, 0), "rpe": "7-8", "rest": 60}
+            },
+            "Peaking": {
+                "Power Cleans": {"sets": "2-3", "reps": "3-5", "percent_1rm": (0.85, 0.95), "rpe": "8-9", "rest": 150},
+                "Sled Pushes": {"sets": "4", "reps": "40m", "percent_1rm": (1.0, 1.0), "rpe": "8-9", "rest": 90},
+                "Bulgarian Split Squats": {"sets": "3", "reps": "5-6/leg", "percent_1rm": (0, 0), "rpe": "8-9", "rest": 60},
+                "Russian Twists": {"sets": "3", "reps": "25/side", "percent_1rm": (0, 0), "rpe": "8", "rest": 60}
+            }
+        }
+    }
+}
+
+RECOVERY_BEHAVIORS = [
+    {"Behavior": "Active Recovery Walk", "Reason": "Reduces soreness, improves mood.", "Mechanism": "Low-intensity movement aids lactate clearance.", "Barrier": "Lack of time; schedule 15-min walk with podcast."},
+    {"Behavior": "Foam Rolling", "Reason": "Relieves tightness, enhances flexibility.", "Mechanism": "Myofascial release improves range of motion.", "Barrier": "Discomfort; start with soft rollers, 5-min sessions."},
+    {"Behavior": "Hydration Focus", "Reason": "Prevents fatigue, supports repair.", "Mechanism": "Water maintains cellular function.", "Barrier": "Forgetting to drink; keep water bottle nearby."},
+    {"Behavior": "Sleep Optimization", "Reason": "Accelerates recovery, hormonal balance.", "Mechanism": "Deep sleep triggers growth hormone.", "Barrier": "Busy schedule; avoid screens before bed."},
+    {"Behavior": "Static Stretching", "Reason": "Improves flexibility, reduces injury risk.", "Mechanism": "Lengthens muscle fibers.", "Barrier": "Boredom; pair with music, 10-min sessions."}
+]
+
+EXERCISE_LIBRARY = {
+    "Strength": [
+        {"name": "SSB Back Squat", "description": "Safety squat bar for quads, glutes, hamstrings."},
+        {"name": "Deadlifts", "description": "Compound lift for posterior chain, grip strength."},
+        {"name": "Hack Squat", "description": "Machine-based squat for quad focus."},
+        {"name": "Leg Press", "description": "Quad and glute hypertrophy with controlled range."},
+        {"name": "Romanian Deadlifts", "description": "Hamstring and glute-focused deadlift variation."},
+        {"name": "Weighted Pull-Ups", "description": "Upper body pulling strength, BJJ grip."},
+        {"name": "Power Cleans", "description": "Explosive lift for power and athleticism."},
+        {"name": "Bulgarian Split Squats", "description": "Unilateral leg strength, stability."},
+        {"name": "Lying Leg Curls", "description": "Hamstring isolation for hypertrophy."},
+        {"name": "Calf Raises", "description": "Calf strength and endurance."},
+        {"name": "Glute-Ham Raises", "description": "Posterior chain strength, BJJ-specific."},
+        {"name": "Seated Calf Raises", "description": "Calf hypertrophy with seated variation."},
+        {"name": "Step-Ups", "description": "Unilateral leg strength, functional movement."}
+    ],
+    "Conditioning": [
+        {"name": "Sprints", "description": "High-intensity running for anaerobic capacity."},
+        {"name": "Sprint Drills", "description": "Short bursts to improve speed and agility."},
+        {"name": "Battle Ropes", "description": "Full-body conditioning, BJJ endurance."},
+        {"name": "Box Jumps", "description": "Plyometric exercise for explosive power."},
+        {"name": "Long Jumps", "description": "Plyometric movement for leg power."},
+        {"name": "Bounding", "description": "Exaggerated strides for power and coordination."},
+        {"name": "Sled Pushes", "description": "Full-body conditioning, strength endurance."},
+        {"name": "Walk/Run Intervals", "description": "Aerobic conditioning for 5k prep."}
+    ],
+    "BJJ Drill": [
+        {"name": "Hanging Leg Raises", "description": "Core strength for BJJ guard work."},
+        {"name": "Plank Variations", "description": "Core stability for grappling."},
+        {"name": "Russian Twists", "description": "Rotational core strength for BJJ sweeps."},
+        {"name": "Farmer’s Carry", "description": "Grip and core endurance for BJJ control."}
+    ]
+}
@@ -0,0 +1,65 @@
+# Dashboard charts. Series are aggregated per day and downsampled here, so a
+# chart sends at most CHART_POINTS points to the browser however long the
+# history, and are drawn with Vega-Lite, which the Streamlit server ships and
+# serves itself (no CDN). Only imported by the Progress Dashboard page.
+import altair as alt
+import numpy as np
+import pandas as pd
+
+CHART_POINTS = 300
+CHART_HEIGHT = 300
+
+def lttb(x, y, points):
+    # Largest-triangle-three-buckets: indices of `points` samples that keep the
+    # shape of the series (peaks and dips survive, flat stretches thin out).
+    # x must be increasing; the first and last points are always kept.
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    keep = np.empty(points, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        after = slice(hi, edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = x[after].mean(), y[after].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+def daily(dates, values, how="last"):
+    # one value per calendar day, oldest first
+    series = pd.Series(np.asarray(values, dtype=float), index=pd.to_datetime(pd.Index(dates), errors="coerce")).dropna()
+    series = series[series.index.notna()].sort_index(kind="stable")
+    return series.groupby(series.index.normalize()).agg(how)
+
+def downsample(series, points=CHART_POINTS):
+    if len(series) <= points:
+        return series
+    return series.iloc[lttb(series.index.asi8, series.to_numpy(), points)]
+
+def line_chart(series, title, colors, points=CHART_POINTS):
+    # series: one Series, or {name: Series} drawn as separate, colored lines;
+    # each is downsampled on its own
+    if isinstance(series, pd.Series):
+        series, colors = {title: series}, [colors]
+    data = pd.concat([downsample(s, points).rename_axis("Date").reset_index(name="value").assign(series=name) for name, s in series.items()], ignore_index=True)
+    color = alt.Color("series:N", title=None, scale=alt.Scale(domain=list(series), range=list(colors)), legend=alt.Legend(orient="bottom") if len(series) > 1 else None)
+    return alt.Chart(data, height=CHART_HEIGHT).mark_line(point=True).encode(
+        x=alt.X("Date:T", title="Date"),
+        y=alt.Y("value:Q", title=title, scale=alt.Scale(zero=False)),
+        color=color,
+        tooltip=[alt.Tooltip("Date:T"), alt.Tooltip("series:N", title="Series"), alt.Tooltip("value:Q", title=title, format=".1f")],
+    )
+
+def bar_chart(labels, values, title, color, domain=None):
+    data = pd.DataFrame({"label": list(labels), "value": list(values)})
+    return alt.Chart(data, height=CHART_HEIGHT).mark_bar(color=color, stroke="#C0C0C0", strokeWidth=1).encode(
+        x=alt.X("label:N", title="Exercise", sort=None),
+        y=alt.Y("value:Q", title=title, scale=alt.Scale(domain=domain) if domain else alt.Undefined),
+        tooltip=[alt.Tooltip("label:N", title="Exercise"), alt.Tooltip("value:Q", title=title, format=".1f")],
+    )
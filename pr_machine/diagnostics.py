@@ -0,0 +1,114 @@
+# Timing spans and per-rerun I/O accounting, shared by every session of the
+# server process.
+import os
+import threading
+import time
+import functools
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+DIAGNOSTICS_SAMPLES = 1000
+DIAGNOSTICS_RERUNS = 200
+DIAGNOSTICS_EVENTS = 100
+
+def _thread_io():
+    # Bytes this thread has passed through read()/write(); each Streamlit
+    # session runs its script in its own thread, so deltas are per rerun.
+    try:
+        with open("/proc/thread-self/io", "rb") as f:
+            fields = dict(line.split(b": ") for line in f.read().splitlines())
+        return int(fields[b"rchar"]), int(fields[b"wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+class Diagnostics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = {}
+        self.reruns = deque(maxlen=DIAGNOSTICS_RERUNS)
+        self.events = deque(maxlen=DIAGNOSTICS_EVENTS)
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, io):
+        with self._lock:
+            if name not in self.spans:
+                self.spans[name] = deque(maxlen=DIAGNOSTICS_SAMPLES)
+            self.spans[name].append((seconds,) + (io or (None, None)))
+
+    def event(self, message):
+        self.events.append((datetime.now().isoformat(timespec="seconds"), message))
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.reruns.clear()
+            self.events.clear()
+
+    def summary(self):
+        # pandas/numpy only once the Diagnostics page asks
+        import numpy as np
+        import pandas as pd
+        with self._lock:
+            spans = {name: list(samples) for name, samples in self.spans.items()}
+        rows = []
+        for name, samples in sorted(spans.items()):
+            ms = np.array([sample[0] for sample in samples]) * 1000
+            read = [sample[1] for sample in samples if sample[1] is not None]
+            written = [sample[2] for sample in samples if sample[2] is not None]
+            p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+            rows.append({
+                "span": name, "calls": len(ms), "mean ms": ms.mean(), "p50 ms": p50, "p90 ms": p90, "p99 ms": p99, "max ms": ms.max(),
+                "avg bytes read": np.mean(read) if read else None, "avg bytes written": np.mean(written) if written else None,
+            })
+        return pd.DataFrame(rows)
+
+class _Span:
+    __slots__ = ("name", "started", "seconds", "io")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.io = _thread_io()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.started
+        io = _thread_io()
+        self.io = (io[0] - self.io[0], io[1] - self.io[1]) if io and self.io else None
+        diagnostics.record(self.name, self.seconds, self.io)
+
+_NO_SPAN = nullcontext()
+
+diagnostics = Diagnostics(os.environ.get("PR_MACHINE_DIAGNOSTICS", "") not in ("", "0"))
+
+def span(name):
+    # Disabled spans are one attribute check and a shared no-op context.
+    return _Span(name) if diagnostics.enabled else _NO_SPAN
+
+def timed(name):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not diagnostics.enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def begin_rerun():
+    rerun = span("rerun")
+    rerun.__enter__()
+    return rerun
+
+def end_rerun(rerun, page):
+    if rerun is _NO_SPAN:
+        return
+    rerun.__exit__(None, None, None)
+    diagnostics.reruns.append({
+        "time": datetime.now().strftime("%H:%M:%S"), "page": page, "ms": rerun.seconds * 1000,
+        "bytes read": rerun.io[0] if rerun.io else None, "bytes written": rerun.io[1] if rerun.io else None,
+    })
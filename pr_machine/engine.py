@@ -0,0 +1,665 @@
+# Per-athlete training data: the log, performance history, 1RMs, recovery and
+# achievement state, and the adaptive prescription engine.
+import streamlit as st
+import numpy as np
+import bisect
+import sys
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from datetime import datetime, timedelta
+from .catalogs import ACHIEVEMENTS, DEFAULT_PROGRAM
+from .diagnostics import diagnostics, timed
+from .storage import _approx_size, file_cache, LOG_TEXT_COLUMNS, LOG_NUMERIC_COLUMNS, parse_log_fields, _date_key, storage
+from .programs import PROGRAM_LIBRARY_FILE, parse_range, prescription_text, program_overrides, _exercise_override, set_program_override, week_phases
+
+def save_achievements(achievements):
+    storage.save_achievements(achievements)
+
+def load_achievements():
+    achievements = storage.load_achievements()
+    if achievements is not None:
+        return achievements
+    return {ach["name"]: False for ach in ACHIEVEMENTS}
+
+def _new_achievement_state():
+    return {"rows": 0, "counts": {ach["name"]: 0 for ach in ACHIEVEMENTS if "counts" in ach}, "min_1rm": {}, "streak": {"last": None, "run": 0, "best": 0}}
+
+def _parse_log_date(text):
+    try:
+        return datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        import pandas as pd
+        logged = pd.to_datetime(text, errors="coerce")
+        return None if pd.isna(logged) else logged.to_pydatetime()
+
+def _apply_achievement_row(state, data):
+    row = {col: data.get(col) if isinstance(data.get(col), str) else "" for col in LOG_TEXT_COLUMNS}
+    state["rows"] += 1
+    for ach in ACHIEVEMENTS:
+        if "counts" in ach and ach["counts"](row):
+            state["counts"][ach["name"]] = state["counts"].get(ach["name"], 0) + 1
+    logged = _to_float(data.get("1RM"))
+    if logged is not None:
+        note = row["Exercise/Note"]
+        state["min_1rm"][note] = min(logged, state["min_1rm"].get(note, logged))
+    # Same rule as a rolling window of 5 over diff().dt.days <= 1 on the Date column.
+    streak = state["streak"]
+    logged_at = _parse_log_date(row["Date"])
+    last = datetime.fromisoformat(streak["last"]) if streak["last"] else None
+    if logged_at is not None and last is not None and (logged_at - last).days <= 1:
+        streak["run"] += 1
+    else:
+        streak["run"] = 0
+    streak["best"] = max(streak["best"], streak["run"])
+    streak["last"] = logged_at.isoformat() if logged_at is not None else None
+
+def rebuild_achievement_state():
+    # _apply_achievement_row over the whole log, one column operation at a time.
+    import pandas as pd
+    with storage.lock("log"):
+        state = _new_achievement_state()
+        df = load_progress(columns=LOG_TEXT_COLUMNS + ["1RM"])
+        text = {col: df[col].fillna("") if col in df and df[col].dtype == object else pd.Series("", index=df.index) for col in LOG_TEXT_COLUMNS}
+        state["rows"] = len(df)
+        for ach in ACHIEVEMENTS:
+            if "counts" in ach:
+                state["counts"][ach["name"]] = int(ach["counts"](text).sum()) if len(df) else 0
+        onerm = pd.to_numeric(df["1RM"], errors="coerce") if "1RM" in df else pd.Series(dtype=float)
+        logged = onerm.notna()
+        state["min_1rm"] = {note: float(value) for note, value in onerm[logged].groupby(text["Exercise/Note"][logged]).min().items()}
+        if len(df):
+            dates = pd.to_datetime(text["Date"], errors="coerce", format="mixed")
+            consecutive = dates.diff().dt.days.le(1)
+            run = consecutive.astype(int).groupby((~consecutive).cumsum()).cumsum()
+            last = dates.iloc[-1]
+            state["streak"] = {"last": last.isoformat() if pd.notna(last) else None, "run": int(run.iloc[-1]), "best": int(run.max())}
+        storage.save_state("achievement_state", state)
+    return state
+
+def update_achievement_state(rows):
+    with storage.lock("log"):
+        state = storage.load_state("achievement_state")
+        if state is None:
+            return rebuild_achievement_state()
+        for row in rows:
+            _apply_achievement_row(state, row)
+        storage.save_state("achievement_state", state)
+    return state
+
+@timed("check_achievements")
+def check_achievements():
+    with storage.lock("log"):
+        state = storage.load_state("achievement_state")
+        if state is None:
+            state = rebuild_achievement_state()
+        onerms = load_1rms()
+        achievements = load_achievements()
+        new_achievements = []
+        for ach in ACHIEVEMENTS:
+            if not achievements.get(ach["name"], False):
+                try:
+                    if state["counts"].get(ach["name"], 0) >= ach["target"] if "counts" in ach else ach["condition"](state, onerms):
+                        achievements[ach["name"]] = True
+                        new_achievements.append(ach)
+                except Exception as e:
+                    diagnostics.event(f"Error checking achievement {ach['name']}: {str(e)}")
+        save_achievements(achievements)
+    return new_achievements
+
+def save_1rm(exercise, onerm):
+    storage.save_1rm(exercise, float(onerm) if onerm else 0, datetime.now().strftime("%Y-%m-%d %H:%M"))
+    file_cache.invalidate((storage.root, "1rm"))
+    file_cache.invalidate((storage.root, "1rm_history"))
+
+def load_1rms():
+    return dict(file_cache.get((storage.root, "1rm"), None, storage.paths("1rm"), storage.load_1rms))
+
+# Estimated 1RMs from a logged weight and rep count; past ESTIMATE_MAX_REPS
+# the formulas drift too far to be worth plotting.
+ESTIMATE_MAX_REPS = 12
+LOGGED_SET_PATTERN = r"x(\d+)(?:-\d+)?\s*@\s*(\d+(?:\.\d+)?)(?:-\d+(?:\.\d+)?)?\s*lbs"
+
+def epley(weight, reps):
+    weight, reps = np.asarray(weight, dtype=float), np.asarray(reps, dtype=float)
+    return np.where(reps == 1, weight, weight * (1 + reps / 30))
+
+def brzycki(weight, reps):
+    weight, reps = np.asarray(weight, dtype=float), np.asarray(reps, dtype=float)
+    return weight * 36 / (37 - reps)
+
+def logged_set_estimates(df):
+    # One row per Workout log row with at least one successful set, from the
+    # low end of the reps and load it was logged with ("3-4x6-10 @ 200-225 lbs").
+    import pandas as pd
+    if df.empty or "Details" not in df:
+        return pd.DataFrame(columns=["Date", "Exercise", "Weight", "Reps", "Epley", "Brzycki"])
+    parsed = df["Details"].fillna("").astype(str).str.extract(LOGGED_SET_PATTERN).apply(pd.to_numeric, errors="coerce")
+    reps, weight = parsed[0], parsed[1]
+    succeeded = pd.to_numeric(df["Sets Succeeded"], errors="coerce") if "Sets Succeeded" in df else pd.Series(1, index=df.index)
+    keep = (df["Type"] == "Workout") & (succeeded > 0) & reps.between(1, ESTIMATE_MAX_REPS) & (weight > 0)
+    return pd.DataFrame({
+        "Date": pd.to_datetime(df["Date"][keep], errors="coerce"),
+        "Exercise": df["Exercise/Note"][keep],
+        "Weight": weight[keep],
+        "Reps": reps[keep],
+        "Epley": epley(weight[keep], reps[keep]),
+        "Brzycki": brzycki(weight[keep], reps[keep]),
+    }).dropna(subset=["Date"]).sort_values("Date", kind="stable").reset_index(drop=True)
+
+class OneRMHistory:
+    # One exercise's recorded 1RMs and logged-set estimates, each sorted by
+    # date so range queries are two searchsorted calls.
+    def __init__(self, entries, estimates):
+        import pandas as pd
+        recorded = pd.DataFrame(entries, columns=["date", "value", "source"])
+        self.recorded = pd.DataFrame({
+            "Date": pd.to_datetime(recorded["date"], errors="coerce"), "1RM": recorded["value"].astype(float), "Source": recorded["source"],
+        }).dropna(subset=["Date"]).sort_values("Date", kind="stable").reset_index(drop=True)
+        self.estimates = estimates.drop(columns="Exercise").reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.recorded) + len(self.estimates)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + int(self.recorded.memory_usage(deep=True).sum() + self.estimates.memory_usage(deep=True).sum())
+
+    @staticmethod
+    def _between(frame, start, end):
+        # start and end are days, both included, as in load_progress()
+        dates = frame["Date"].to_numpy()
+        lo = dates.searchsorted(np.datetime64(_date_key(start)), "left") if start is not None else 0
+        hi = dates.searchsorted(np.datetime64(_date_key(end)) + np.timedelta64(1, "D"), "left") if end is not None else len(dates)
+        return frame.iloc[lo:hi]
+
+    def between(self, start=None, end=None):
+        return self._between(self.recorded, start, end)
+
+    def estimated(self, start=None, end=None):
+        return self._between(self.estimates, start, end)
+
+    def value_on(self, day):
+        # the recorded 1RM in effect at the end of `day`
+        recorded = self.between(None, day)
+        return float(recorded["1RM"].iloc[-1]) if len(recorded) else None
+
+def _load_1rm_history():
+    entries = {}
+    for entry in storage.load_1rm_history():
+        entries.setdefault(entry["exercise"], []).append(entry)
+    return entries
+
+@timed("onerm_history")
+def onerm_history(exercise):
+    # Recorded values come from the whole (small) history, estimates from the
+    # exercise's log rows; both are cached until either store changes.
+    flush_log()
+
+    def build():
+        entries = file_cache.get((storage.root, "1rm_history"), None, storage.paths("1rm_history"), _load_1rm_history)
+        log = load_progress(exercise, columns=["Date", "Type", "Exercise/Note", "Details", "Sets Succeeded"])
+        estimates = logged_set_estimates(log[log["Exercise/Note"] == exercise])
+        return OneRMHistory(entries.get(exercise, []), estimates)
+    return file_cache.get((storage.root, "1rm_history"), exercise, storage.paths("1rm_history") + storage.paths("log"), build)
+
+class PerformanceHistory:
+    # One exercise's sets ordered by date (ties keep logging order), so the
+    # window queries the adaptive engine runs are bisects instead of scans.
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: entry["date"])
+        self.dates = [entry["date"] for entry in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __sizeof__(self):
+        # dates shares its strings with entries
+        return object.__sizeof__(self) + _approx_size(self.entries) + sys.getsizeof(self.dates)
+
+    def between(self, start=None, end=None):
+        lo = bisect.bisect_left(self.dates, start) if start is not None else 0
+        hi = bisect.bisect_right(self.dates, end) if end is not None else len(self.dates)
+        return self.entries[lo:hi]
+
+    def on(self, day):
+        return self.between(day, day)
+
+    def recent(self, n, days, today=None):
+        since = ((today or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d")
+        lo = bisect.bisect_left(self.dates, since)
+        return self.entries[max(lo, len(self.entries) - n):]
+
+def save_performance(exercise, date, success, set_number):
+    storage.save_performance(exercise, date, success, set_number)
+    file_cache.invalidate((storage.root, "performance"), exercise)
+    file_cache.invalidate((storage.root, "performance_summary"))
+
+def _load_performance_summary():
+    return {
+        exercise: dict(totals, rate=totals["successes"] / totals["total"] * 100 if totals["total"] else 0)
+        for exercise, totals in storage.load_performance_summary().items()
+    }
+
+def performance_summary():
+    return file_cache.get((storage.root, "performance_summary"), None, storage.paths("performance_summary"), _load_performance_summary)
+
+@timed("performance_history")
+def performance_history(exercise):
+    return file_cache.get((storage.root, "performance"), exercise, storage.paths("performance", exercise), lambda: PerformanceHistory(storage.load_performance(exercise)))
+
+@timed("load_performance")
+def load_performance(exercise):
+    return list(performance_history(exercise).entries)
+
+RECOVERY_METRICS = ["Weight", "Calories"]
+RECOVERY_WINDOWS = (7, 28)
+RECOVERY_EWMA_SPAN = 7
+
+# Recovery aggregates are kept as running sums/counts, an EWMA over entries and
+# per-day buckets covering the longest rolling window, updated on every flush.
+def _new_recovery_state():
+    return {"rows": 0, "metrics": {metric: {"sum": 0.0, "count": 0, "ewma": None, "days": {}} for metric in RECOVERY_METRICS}}
+
+def _prune_recovery_days(days):
+    try:
+        latest = datetime.strptime(max(days), "%Y-%m-%d")
+    except ValueError:
+        return days
+    cutoff = (latest - timedelta(days=max(RECOVERY_WINDOWS))).strftime("%Y-%m-%d")
+    return {day: bucket for day, bucket in days.items() if day > cutoff}
+
+def _apply_recovery_row(state, data):
+    state["rows"] += 1
+    day = str(data.get("Date") or "")[:10]
+    alpha = 2 / (RECOVERY_EWMA_SPAN + 1)
+    for metric in RECOVERY_METRICS:
+        value = _to_float(data.get(metric))
+        if value is None:
+            continue
+        totals = state["metrics"][metric]
+        totals["sum"] += value
+        totals["count"] += 1
+        totals["ewma"] = value if totals["ewma"] is None else alpha * value + (1 - alpha) * totals["ewma"]
+        bucket = totals["days"].setdefault(day, [0.0, 0])
+        bucket[0] += value
+        bucket[1] += 1
+        totals["days"] = _prune_recovery_days(totals["days"])
+
+def rebuild_recovery_state():
+    import pandas as pd
+    with storage.lock("log"):
+        state = _new_recovery_state()
+        df = load_progress(columns=["Date"] + RECOVERY_METRICS)
+        for metric in RECOVERY_METRICS:
+            values = pd.to_numeric(df[metric], errors="coerce").dropna() if metric in df else pd.Series(dtype=float)
+            if values.empty:
+                continue
+            daily = values.groupby(df.loc[values.index, "Date"].astype(str).str[:10]).agg(["sum", "count"])
+            state["metrics"][metric] = {
+                "sum": float(values.sum()),
+                "count": int(len(values)),
+                "ewma": float(values.ewm(span=RECOVERY_EWMA_SPAN, adjust=False).mean().iloc[-1]),
+                "days": _prune_recovery_days({day: [float(row["sum"]), int(row["count"])] for day, row in daily.iterrows()}),
+            }
+        state["rows"] = len(df)
+        storage.save_state("recovery_state", state)
+    file_cache.invalidate((storage.root, "recovery_state"))
+    return state
+
+def update_recovery_state(rows):
+    with storage.lock("log"):
+        state = storage.load_state("recovery_state")
+        if state is None:
+            return rebuild_recovery_state()
+        for row in rows:
+            _apply_recovery_row(state, row)
+        storage.save_state("recovery_state", state)
+    file_cache.invalidate((storage.root, "recovery_state"))
+    return state
+
+def recovery_trends(today=None):
+    state = file_cache.get((storage.root, "recovery_state"), None, storage.paths("state", "recovery_state"), lambda: storage.load_state("recovery_state"))
+    if state is None:
+        state = rebuild_recovery_state()
+    today = today or datetime.now()
+    trends = {}
+    for metric, totals in state["metrics"].items():
+        trend = {"mean": totals["sum"] / totals["count"] if totals["count"] else None, "count": totals["count"], "ewma": totals["ewma"]}
+        for window in RECOVERY_WINDOWS:
+            since = (today - timedelta(days=window - 1)).strftime("%Y-%m-%d")
+            buckets = [bucket for day, bucket in totals["days"].items() if day >= since]
+            count = sum(bucket[1] for bucket in buckets)
+            trend[f"mean_{window}d"] = sum(bucket[0] for bucket in buckets) / count if count else None
+        trends[metric] = trend
+    return trends
+
+def get_recovery_metrics():
+    trends = recovery_trends()
+    return trends["Weight"]["mean"], trends["Calories"]["mean"]
+
+PRESCRIPTION_SESSIONS = {"Conservative": 5, "Moderate": 4, "Aggressive": 3}
+
+# The prescription engine is pure: prescribe_day() gets the histories, overrides
+# and recovery modifier passed in and returns new values; loading, saving and
+# messages are left to day_prescriptions() and the page.
+def _adjust_prescription(base, adjusted, recent, fails_today, recovery_modifier):
+    adjusted = dict(adjusted)
+    score = sum(1 if entry['success'] else -1 for entry in recent)
+
+    rpe = parse_range(adjusted.get('rpe') or None)
+    if fails_today >= 2 and rpe:
+        adjusted['rpe'] = rpe.replace(rpe.low - 1, rpe.high - 1)
+
+    sets = parse_range(adjusted.get('sets') or None)
+    rest = None
+    if score <= -3:
+        if adjusted.get('percent_1rm'):
+            adjusted['percent_1rm'] = (max(0.5, adjusted['percent_1rm'][0] - 0.05 + recovery_modifier),
+                                      max(0.5, adjusted['percent_1rm'][1] - 0.05 + recovery_modifier))
+        if sets:
+            adjusted['sets'] = sets.replace(min(5, sets.high + 1)) if sets.single else sets.replace(sets.low, min(5, sets.high + 1))
+        if "rest" in base:
+            rest = min(180, base["rest"] + 30)
+    elif score >= 3:
+        if adjusted.get('percent_1rm'):
+            adjusted['percent_1rm'] = (min(0.95, adjusted['percent_1rm'][0] + 0.05),
+                                      min(1.0, adjusted['percent_1rm'][1] + 0.05))
+        if sets:
+            adjusted['sets'] = sets.replace(max(2, sets.low - 1), max(2, sets.high - 1))
+        if "rest" in base:
+            rest = max(30, base["rest"] - 15)
+    return MappingProxyType({"prescription": MappingProxyType(adjusted), "score": score, "deload": score <= -3, "rest": rest})
+
+def prescribe_day(program, workout_day, phase, histories, overrides, recovery_modifier=0, sensitivity="Moderate", today=None):
+    # histories maps each exercise to its PerformanceHistory. Returns, per
+    # exercise, the adjusted prescription, the score, the deload flag and the
+    # rest time the program should adapt to (None to leave it).
+    today = today or datetime.now()
+    current_date = today.strftime("%Y-%m-%d")
+    n = PRESCRIPTION_SESSIONS.get(sensitivity, 4)
+    prescriptions = program["prescriptions"].get(workout_day, {}).get(phase, {})
+    results = {}
+    for exercise, history in histories.items():
+        base = prescriptions.get(exercise, {})
+        adjusted = dict(base)
+        adjusted.update(_exercise_override(overrides, program["name"], workout_day, phase, exercise))
+        fails_today = sum(1 for entry in history.on(current_date) if not entry['success'])
+        results[exercise] = _adjust_prescription(base, adjusted, history.recent(n, 14, today), fails_today, recovery_modifier)
+    return MappingProxyType(results)
+
+def recovery_modifier(trends, current):
+    # current: today's entered values by metric; each one 5% under its
+    # all-time or recent level takes 0.05 off a deload's %1RM
+    modifier = 0
+    for metric, value in current.items():
+        baselines = [trends[metric]["mean"], trends[metric][f"mean_{RECOVERY_WINDOWS[-1]}d"]]
+        if any(baseline and value < 0.95 * baseline for baseline in baselines):
+            modifier -= 0.05
+    return modifier
+
+def _current_recovery():
+    current = {}
+    for metric in RECOVERY_METRICS:
+        if metric in st.session_state and st.session_state[metric]:
+            try:
+                current[metric] = float(st.session_state[metric])
+            except ValueError:
+                continue
+    return current
+
+def _prescribe_day_text(*args):
+    results = prescribe_day(*args)
+    return MappingProxyType({exercise: dict(result, prescription=prescription_text(result["prescription"])) for exercise, result in results.items()})
+
+@timed("day_prescriptions")
+def day_prescriptions(program, workout_day, phase, sensitivity="Moderate", exercises=None):
+    # Every exercise of a workout day in one engine call, prescriptions as
+    # text. Read-only like prescribe_day(): results are cached until a
+    # performance file or the overrides change (or the day, the sensitivity
+    # or today's recovery numbers do); update_prescription() persists rest.
+    exercises = list(exercises if exercises is not None else program["days"].get(workout_day, {}).get("exercises", ()))
+    current = _current_recovery()
+    modifier = recovery_modifier(recovery_trends(), current) if current else 0
+    today = datetime.now()
+    key = (program["name"], workout_day, phase, sensitivity, tuple(exercises), modifier, today.strftime("%Y-%m-%d"))
+    paths = [path for exercise in exercises for path in storage.paths("performance", exercise)]
+    paths += storage.paths("state", "program_overrides") + [PROGRAM_LIBRARY_FILE]
+    return file_cache.get((storage.root, "day_prescriptions"), key, paths, lambda: _prescribe_day_text(
+        program, workout_day, phase, {exercise: performance_history(exercise) for exercise in exercises},
+        program_overrides(), modifier, sensitivity, today,
+    ))
+
+@timed("update_prescription")
+def update_prescription(exercise, success, set_number, workout_day, phase, sensitivity="Moderate", program=DEFAULT_PROGRAM):
+    # Logs a set (when given) and returns that exercise's adjusted prescription and score.
+    if success is not None and set_number is not None:
+        save_performance(exercise, datetime.now().strftime("%Y-%m-%d"), success, set_number)
+    exercises = program["days"].get(workout_day, {}).get("exercises", ())
+    result = day_prescriptions(program, workout_day, phase, sensitivity, exercises if exercise in exercises else [exercise])[exercise]
+    if result["rest"] is not None:
+        set_program_override(program["name"], workout_day, phase, exercise, rest=result["rest"])
+    return dict(result["prescription"]), result["score"]
+
+def suggest_weight(exercise, onerm, phase, percent_1rm):
+    if onerm <= 0 or percent_1rm == (0, 0):
+        return "Bodyweight/Non-weighted"
+    low = round(onerm * percent_1rm[0] / 5) * 5
+    high = round(onerm * percent_1rm[1] / 5) * 5
+    return f"{low}-{high} lbs"
+
+def _to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+def rpe_ceiling(rpe):
+    rpe = parse_range(rpe)
+    return float(rpe.high) if rpe else None
+
+class _LogBuffer(threading.local):
+    # Rows saved but not appended yet, rows appended but not checked for
+    # achievements yet, and the batched_log_writes() nesting. Kept per thread
+    # like `storage`, since the rows belong to the session's athlete.
+    def __init__(self):
+        self.pending = []
+        self.unchecked = []
+        self.depth = 0
+
+_log_buffer = _LogBuffer()
+
+def flush_log():
+    rows = _log_buffer.pending[:]
+    del _log_buffer.pending[:]
+    if rows:
+        # The derived states must cover exactly the rows in the log, so other
+        # sessions can't append (or rebuild) between our append and our update.
+        with storage.lock("log"):
+            storage.append_log(rows)
+            file_cache.invalidate((storage.root, "log"))
+            update_recovery_state(rows)
+            update_achievement_state(rows)
+        _log_buffer.unchecked.extend(rows)
+    return len(rows)
+
+def _announce_achievements():
+    del _log_buffer.unchecked[:]
+    new_achievements = check_achievements()
+    for ach in new_achievements:
+        st.success(f"{ach['emoji']} {ach['name']} Unlocked! {ach['description']}")
+
+@contextmanager
+def batched_log_writes():
+    _log_buffer.depth += 1
+    try:
+        yield
+    finally:
+        _log_buffer.depth -= 1
+        if _log_buffer.depth == 0:
+            flush_log()
+            if _log_buffer.unchecked:
+                _announce_achievements()
+
+@timed("save_log")
+def save_log(entry_type, data):
+    import pandas as pd
+    missing = [col for col in LOG_NUMERIC_COLUMNS if col not in data]
+    if missing:
+        data = dict(data, **parse_log_fields(pd.DataFrame([data]))[missing].iloc[0].to_dict())
+    _log_buffer.pending.append(data)
+    if _log_buffer.depth:
+        return
+    flush_log()
+    _announce_achievements()
+
+@timed("load_progress")
+def load_progress(filter_by="", start=None, end=None, columns=None):
+    flush_log()
+    key = (
+        filter_by,
+        _date_key(start) if start is not None else None,
+        _date_key(end) if end is not None else None,
+        tuple(columns) if columns is not None else None,
+    )
+    # Cached frames are shared between reruns and sessions; don't modify them in place.
+    return file_cache.get((storage.root, "log"), key, storage.paths("log"), lambda: storage.load_log(filter_by, start, end, columns))
+
+LOG_PAGE_SIZE = 50
+
+class LogIndex:
+    # The log's row numbers ordered by (date, row), with the columns the
+    # history page filters on, for backends without an index of their own.
+    # A filter is a mask over these arrays; a page is a slice of the result.
+    def __init__(self, df):
+        dates = df["Date"].astype(str).to_numpy().astype(str) if len(df) else np.array([], dtype=str)
+        rows = df.index.to_numpy()
+        order = np.lexsort((rows, dates))
+        self.rows = rows[order]
+        self.dates = dates[order]
+        self.types = df["Type"].astype(str).to_numpy()[order] if len(df) else np.array([], dtype=str)
+        self.exercises = df["Exercise/Note"].astype(str).str.lower().to_numpy()[order] if len(df) else np.array([], dtype=str)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sum(a.nbytes for a in (self.rows, self.dates, self.types, self.exercises))
+
+    def select(self, start=None, end=None, types=(), exercise=""):
+        # -> (dates, rows) of the matching rows, still in (date, row) order
+        lo = self.dates.searchsorted(_date_key(start), "left") if start is not None else 0
+        hi = self.dates.searchsorted((datetime.strptime(_date_key(end), "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d"), "left") if end is not None else len(self)
+        mask = np.ones(max(hi - lo, 0), dtype=bool)
+        if types:
+            mask &= np.isin(self.types[lo:hi], list(types))
+        if exercise:
+            mask &= self.exercises[lo:hi] == exercise.lower()
+        return self.dates[lo:hi][mask], self.rows[lo:hi][mask]
+
+LOG_INDEX_COLUMNS = ["Date", "Type", "Exercise/Note"]
+
+def _log_index():
+    # built from the three columns it needs; the frame itself isn't cached
+    return file_cache.get((storage.root, "log"), ("index",), storage.paths("log"), lambda: LogIndex(storage.load_log(columns=LOG_INDEX_COLUMNS)))
+
+def progress_page(cursor=None, limit=LOG_PAGE_SIZE, newest_first=True, start=None, end=None, types=(), exercise=""):
+    # One page of the log -> (rows, cursor for the next page or None, total
+    # matching rows). Cursors are the (date, row id) of a page's last row.
+    flush_log()
+    if hasattr(storage, "log_page"):
+        return storage.log_page(cursor, limit, newest_first, start, end, tuple(types), exercise)
+    key = ("page", _date_key(start) if start is not None else None, _date_key(end) if end is not None else None, tuple(types), exercise.lower())
+    dates, rows = file_cache.get((storage.root, "log"), key, storage.paths("log"), lambda: _log_index().select(start, end, types, exercise))
+    if cursor is None:
+        position = len(rows) if newest_first else 0
+    else:
+        lo, hi = dates.searchsorted(cursor[0], "left"), dates.searchsorted(cursor[0], "right")
+        position = lo + rows[lo:hi].searchsorted(cursor[1], "left" if newest_first else "right")
+    page = slice(max(position - limit, 0), position) if newest_first else slice(position, position + limit)
+    page_dates, page_rows = dates[page], rows[page]
+    if newest_first:
+        page_dates, page_rows = page_dates[::-1], page_rows[::-1]
+    more = page.start > 0 if newest_first else page.stop < len(rows)
+    next_cursor = (str(page_dates[-1]), int(page_rows[-1])) if more and len(page_rows) else None
+    # only this page's rows are read (and kept) for a backend without log_page()
+    page_frame = file_cache.get((storage.root, "log"), ("rows",) + tuple(int(row) for row in page_rows), storage.paths("log"), lambda: storage.load_log_rows(page_rows, page_dates))
+    return page_frame, next_cursor, len(rows)
+
+class LoadPlan:
+    # Target loads for every week x workout day x exercise of a program from
+    # the current 1RMs, computed in one pass: loads[week - 1, day, exercise]
+    # is (low, high) in lbs rounded to 5, NaN where there is no weighted target.
+    def __init__(self, program, onerms):
+        self.program = program
+        self.days = list(program["days"])
+        self.exercises = list(dict.fromkeys(ex for details in program["days"].values() for ex in details["exercises"]))
+        self.weeks = program["duration_weeks"]
+        self.phases, week_phase = week_phases(program, np.arange(1, self.weeks + 1))
+        day_index = {day: i for i, day in enumerate(self.days)}
+        exercise_index = {ex: i for i, ex in enumerate(self.exercises)}
+        # NaN (no target) where a prescription has no %1RM, e.g. conditioning work
+        self.percent = np.full((len(self.phases), len(self.days), len(self.exercises), 2), np.nan)
+        for day, by_phase in program["prescriptions"].items():
+            for phase, prescriptions in by_phase.items():
+                if day not in day_index or phase not in self.phases:
+                    continue
+                for exercise, prescription in prescriptions.items():
+                    if exercise in exercise_index and prescription.get("percent_1rm") is not None:
+                        self.percent[self.phases.index(phase), day_index[day], exercise_index[exercise]] = prescription["percent_1rm"]
+        self.onerms = np.array([onerms.get(ex, 0) or 0 for ex in self.exercises], dtype=float)
+        percent = self.percent[week_phase]
+        loads = np.round(self.onerms[None, None, :, None] * percent / 5) * 5
+        self.loads = np.where((self.onerms[None, None, :, None] > 0) & (percent.sum(axis=-1, keepdims=True) > 0), loads, np.nan)
+        self._days = day_index
+        self._exercises = exercise_index
+
+    def weight(self, week, day, exercise, percent_1rm=None):
+        # The plan's text for suggest_weight(); an adjusted %1RM is worked out on the spot.
+        if day not in self._days or exercise not in self._exercises or not 1 <= week <= self.weeks:
+            return suggest_weight(exercise, 0, None, percent_1rm or (0, 0))
+        d, e = self._days[day], self._exercises[exercise]
+        if percent_1rm is not None and tuple(percent_1rm) != tuple(self.percent[week_phases(self.program, [week])[1][0], d, e]):
+            return suggest_weight(exercise, self.onerms[e], None, percent_1rm)
+        low, high = self.loads[week - 1, d, e]
+        return "Bodyweight/Non-weighted" if np.isnan(low) else f"{int(low)}-{int(high)} lbs"
+
+    def day_loads(self, week, day):
+        if day not in self._days or not 1 <= week <= self.weeks:
+            return {}
+        row = self.loads[week - 1, self._days[day]]
+        return {ex: (int(row[e, 0]), int(row[e, 1])) for ex, e in self._exercises.items() if not np.isnan(row[e, 0])}
+
+    def frame(self):
+        import pandas as pd
+        weeks, days, exercises = np.meshgrid(np.arange(1, self.weeks + 1), np.arange(len(self.days)), np.arange(len(self.exercises)), indexing="ij")
+        df = pd.DataFrame({
+            "Week": weeks.ravel(),
+            "Phase": np.array(self.phases, dtype=object)[week_phases(self.program, weeks.ravel())[1]],
+            "Day": np.array(self.days, dtype=object)[days.ravel()],
+            "Exercise": np.array(self.exercises, dtype=object)[exercises.ravel()],
+            "Low (lbs)": self.loads[..., 0].ravel(),
+            "High (lbs)": self.loads[..., 1].ravel(),
+        })
+        return df[df["Low (lbs)"].notna()].reset_index(drop=True)
+
+def load_plan(program):
+    # rebuilt only when a 1RM (or the program library) changes
+    return file_cache.get((storage.root, "load_plan"), program["name"], storage.paths("1rm") + [PROGRAM_LIBRARY_FILE], lambda: LoadPlan(program, load_1rms()))
+
+def format_prescription(prescription, exercise, onerm):
+    if "duration" in prescription:
+        duration = prescription.get('duration', '')
+        distance = prescription.get('distance', '')
+        pace = prescription.get('pace', '')
+        rpe = prescription.get('rpe', '')
+        return f"{duration}, {distance}, {pace}, RPE {rpe}"
+    sets = prescription.get('sets', '')
+    reps = prescription.get('reps', '')
+    percent_1rm = prescription.get('percent_1rm')
+    rpe = prescription.get('rpe', '')
+    if percent_1rm is None:
+        # no load to suggest
+        return f"{sets}x{reps}, RPE {rpe}"
+    weight = suggest_weight(exercise, onerm, None, percent_1rm)
+    return f"{sets}x{reps} @ {weight}, RPE {rpe}"
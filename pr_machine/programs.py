@@ -0,0 +1,664 @@
+# Program library and registry, prescription ranges, validation, import and
+# schedules.
+import numpy as np
+import json
+import os
+import codecs
+import re
+import zipfile
+import functools
+from types import MappingProxyType
+from datetime import date, timedelta
+import calendar
+from .catalogs import DEFAULT_PROGRAM, BJJ_PROGRAM
+from .storage import _approx_size, file_cache, file_lock, atomic_write_json, storage
+
+PROGRAM_LIBRARY_FILE = "program_library.json"
+def save_programs(programs):
+    # One read and one write of the library for a batch; returns, per
+    # program, whether it was saved (False when the name is taken).
+    with file_lock(PROGRAM_LIBRARY_FILE):
+        library = _read_programs()
+        names = {p["name"] for p in library}
+        saved = []
+        for program in programs:
+            saved.append(program["name"] not in names)
+            names.add(program["name"])
+        if any(saved):
+            atomic_write_json(PROGRAM_LIBRARY_FILE, library + [program for program, ok in zip(programs, saved) if ok])
+    if any(saved):
+        file_cache.invalidate("programs")
+    return saved
+
+def save_program(program):
+    return save_programs([program])[0]
+
+def _read_programs():
+    if os.path.exists(PROGRAM_LIBRARY_FILE):
+        with open(PROGRAM_LIBRARY_FILE, 'r') as f:
+            return json.load(f)
+    return [DEFAULT_PROGRAM, BJJ_PROGRAM]
+
+RANGE_FIELDS = ("sets", "reps", "rpe", "duration")
+_RANGE_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?(.*)", re.S)
+
+def _number(text):
+    return float(text) if "." in text else int(text)
+
+class PrescriptionRange:
+    # "3-4" sets, "6-8/leg" reps, "7-8" RPE, "30-40 min": parsed once when a
+    # program is loaded so the engine works on numbers; str() gives the text back.
+    __slots__ = ("low", "high", "unit")
+
+    def __init__(self, low, high=None, unit=""):
+        self.low = low
+        self.high = low if high is None else high
+        self.unit = unit
+
+    @classmethod
+    def parse(cls, text):
+        match = _RANGE_PATTERN.fullmatch(str(text))
+        if not match:
+            raise ValueError(f"Invalid range: {text!r}")
+        low = _number(match.group(1))
+        high = _number(match.group(2)) if match.group(2) else low
+        if high < low:
+            raise ValueError(f"Invalid range: {text!r}")
+        return cls(low, high, match.group(3).rstrip())
+
+    @property
+    def single(self):
+        return self.low == self.high
+
+    def replace(self, low, high=None):
+        # same unit, new bounds (a single value stays single when high is omitted)
+        return PrescriptionRange(low, high, self.unit)
+
+    def __eq__(self, other):
+        return isinstance(other, PrescriptionRange) and (self.low, self.high, self.unit) == (other.low, other.high, other.unit)
+
+    def __hash__(self):
+        return hash((self.low, self.high, self.unit))
+
+    def __str__(self):
+        low, high = (f"{value:g}" if isinstance(value, float) else str(value) for value in (self.low, self.high))
+        return (low if self.single else f"{low}-{high}") + self.unit
+
+    def __repr__(self):
+        return f"PrescriptionRange({str(self)!r})"
+
+@functools.lru_cache(maxsize=4096)
+def _parse_range_text(text):
+    # programs repeat the same few texts; ranges are never mutated, so they're shared
+    try:
+        return PrescriptionRange.parse(text)
+    except ValueError:
+        return None
+
+def parse_range(value):
+    # A PrescriptionRange from a stored range or its text; None when missing or malformed.
+    if isinstance(value, PrescriptionRange) or value is None:
+        return value
+    return _parse_range_text(str(value))
+
+def parse_percent(value):
+    # %1RM as a (low, high) pair of floats from a pair or "0.65-0.75"
+    if isinstance(value, str):
+        value = parse_range(value)
+        if value is None or value.unit:
+            return None
+        value = (value.low, value.high)
+    try:
+        low, high = (float(x) for x in value)
+    except (TypeError, ValueError):
+        return None
+    return (low, high) if 0 <= low <= high <= 1.0 else None
+
+def parse_prescription(prescription):
+    parsed = dict(prescription)
+    for field in RANGE_FIELDS:
+        if field in parsed:
+            parsed[field] = parse_range(parsed[field]) or parsed[field]
+    if "percent_1rm" in parsed:
+        parsed["percent_1rm"] = parse_percent(parsed["percent_1rm"]) or parsed["percent_1rm"]
+    return parsed
+
+def prescription_text(prescription):
+    # parse_prescription() undone: ranges back to the text they came from.
+    # Adjusted bounds print without a trailing ".0" ("6-7", not "6.0-7.0").
+    return {field: str(value) if isinstance(value, PrescriptionRange) else value for field, value in prescription.items()}
+
+def parse_program(program):
+    # Text that doesn't parse is kept as it was; validate_program reports it.
+    prescriptions = program.get("prescriptions")
+    if not isinstance(prescriptions, dict):
+        return program
+    return dict(program, prescriptions={
+        day: {
+            phase: {exercise: parse_prescription(p) if isinstance(p, dict) else p for exercise, p in by_exercise.items()} if isinstance(by_exercise, dict) else by_exercise
+            for phase, by_exercise in by_phase.items()
+        } if isinstance(by_phase, dict) else by_phase
+        for day, by_phase in prescriptions.items()
+    })
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class ProgramRegistry:
+    # Programs are validated and frozen once per version of the library file
+    # and shared by every session; per-athlete adaptations live in overrides.
+    def __init__(self, programs):
+        self.programs = {}
+        self.invalid = {}
+        for program in programs:
+            valid, message = validate_program(program)
+            if not valid:
+                # kept loadable, as before; the message is there for reporting
+                self.invalid[program["name"]] = message
+            self.programs[program["name"]] = _freeze(parse_program(program))
+        self.names = list(self.programs)
+        self.exercises = sorted({exercise for program in self.programs.values() for details in program.get("days", {}).values() for exercise in details.get("exercises", ())})
+        self._schedules = {}
+
+    def __iter__(self):
+        return iter(self.programs.values())
+
+    def __len__(self):
+        return len(self.programs)
+
+    def __contains__(self, name):
+        return name in self.programs
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sum(_approx_size(value) for value in (self.programs, self.invalid, self.names, self.exercises))
+
+    def get(self, name, default=None):
+        return self.programs.get(name, default)
+
+    def schedule(self, program, start):
+        key = (program["name"], start)
+        schedule = self._schedules.get(key)
+        if schedule is None or schedule.program is not program:
+            schedule = self._schedules[key] = ProgramSchedule(program, start)
+        return schedule
+
+def program_registry():
+    return file_cache.get("programs", None, [PROGRAM_LIBRARY_FILE], lambda: ProgramRegistry(_read_programs()))
+
+def load_programs():
+    return list(program_registry())
+
+# Adaptive changes never touch the shared programs. They are stored per athlete
+# as {program: {day: {phase: {exercise: {field: value}}}}} and laid over the
+# library prescription whenever it is read.
+def program_overrides():
+    return file_cache.get((storage.root, "program_overrides"), None, storage.paths("state", "program_overrides"), lambda: storage.load_state("program_overrides") or {})
+
+def _exercise_override(overrides, program_name, day, phase, exercise):
+    return overrides.get(program_name, {}).get(day, {}).get(phase, {}).get(exercise, {})
+
+def adapted_prescription(program, day, phase, exercise):
+    prescription = dict(program["prescriptions"].get(day, {}).get(phase, {}).get(exercise, {}))
+    prescription.update(_exercise_override(program_overrides(), program["name"], day, phase, exercise))
+    return prescription
+
+def set_program_override(program_name, day, phase, exercise, **fields):
+    current = _exercise_override(program_overrides(), program_name, day, phase, exercise)
+    if all(current.get(key) == value for key, value in fields.items()):
+        return False
+    with storage.lock("program_overrides"):
+        overrides = storage.load_state("program_overrides") or {}
+        current = _exercise_override(overrides, program_name, day, phase, exercise)
+        overrides.setdefault(program_name, {}).setdefault(day, {}).setdefault(phase, {})[exercise] = dict(current, **fields)
+        storage.save_state("program_overrides", overrides)
+    file_cache.invalidate((storage.root, "program_overrides"))
+    return True
+
+PROGRAM_KEYS = ("name", "duration_weeks", "description", "days", "prescriptions")
+PROGRAM_PHASES = ("Base", "Intensity", "Peaking")
+DAY_KEYS = frozenset(("description", "exercises", "schedule"))
+
+class ProgramValidator:
+    # Checks a program a piece at a time: a whole program in validate_program,
+    # or day by day while an upload is still being parsed (stream_program).
+    # Exercise lookups are set lookups and every error is collected rather
+    # than stopping at the first. Prescriptions for a day not seen yet wait in
+    # `pending` until it arrives or the days are complete.
+    def __init__(self):
+        self.errors = []
+        self.keys = set()
+        self.days = {}
+        self.days_complete = False
+        self.pending = {}
+
+    def key(self, key, value):
+        self.keys.add(key)
+        if key in ("days", "prescriptions") and not isinstance(value, dict):
+            self.errors.append(f"Invalid {key}: expected an object")
+
+    def day(self, day, details):
+        if not isinstance(details, dict) or not DAY_KEYS <= details.keys():
+            self.errors.append(f"Invalid day structure for {day}")
+            # still a known day; its exercises just can't be checked
+            self.days[day] = set(details["exercises"]) if isinstance(details, dict) and isinstance(details.get("exercises"), list) else None
+        else:
+            if not isinstance(details["schedule"], list) or not all(isinstance(weekday, int) and 0 <= weekday <= 6 for weekday in details["schedule"]):
+                self.errors.append(f"Invalid schedule days for {day}")
+            self.days[day] = set(details["exercises"]) if isinstance(details["exercises"], list) else None
+        if day in self.pending:
+            self.prescriptions(day, self.pending.pop(day))
+
+    def end_days(self):
+        self.days_complete = True
+        for day in self.pending:
+            self.errors.append(f"Prescription day {day} not in days")
+        self.pending.clear()
+
+    def prescriptions(self, day, phases):
+        if day not in self.days:
+            if self.days_complete:
+                self.errors.append(f"Prescription day {day} not in days")
+            else:
+                self.pending[day] = phases
+            return
+        if not isinstance(phases, dict):
+            self.errors.append(f"Invalid prescriptions for {day}")
+            return
+        exercises = self.days[day]
+        for phase in PROGRAM_PHASES:
+            if phase not in phases:
+                self.errors.append(f"Missing phase {phase} for {day}")
+                continue
+            if not isinstance(phases[phase], dict):
+                self.errors.append(f"Invalid {phase} prescriptions for {day}")
+                continue
+            for exercise, prescription in phases[phase].items():
+                if exercises is not None and exercise not in exercises:
+                    self.errors.append(f"Exercise {exercise} not in {day} exercises ({phase})")
+                if not isinstance(prescription, dict):
+                    self.errors.append(f"Invalid prescription for {exercise} in {day} ({phase})")
+                    continue
+                # conditioning work is prescribed by duration instead of sets
+                if "sets" not in prescription and "duration" not in prescription:
+                    self.errors.append(f"Missing sets for {exercise} in {day} ({phase})")
+                if "rest" not in prescription:
+                    self.errors.append(f"Missing rest for {exercise} in {day} ({phase})")
+                for field in RANGE_FIELDS:
+                    if field in prescription and parse_range(prescription[field]) is None:
+                        self.errors.append(f"Invalid {field} for {exercise} in {day} ({phase})")
+                if "percent_1rm" in prescription and parse_percent(prescription["percent_1rm"]) is None:
+                    self.errors.append(f"Invalid percent_1rm for {exercise} in {day} ({phase})")
+
+    def finish(self):
+        missing = [f"Missing key: {key}" for key in PROGRAM_KEYS if key not in self.keys]
+        if not self.days_complete:
+            self.end_days()
+        self.errors[:0] = missing
+        return self.errors
+
+def program_errors(program):
+    if not isinstance(program, dict):
+        return ["Invalid program: expected an object"]
+    validator = ProgramValidator()
+    for key, value in program.items():
+        validator.key(key, value)
+    if isinstance(program.get("days"), dict):
+        for day, details in program["days"].items():
+            validator.day(day, details)
+        validator.end_days()
+    if isinstance(program.get("prescriptions"), dict):
+        for day, phases in program["prescriptions"].items():
+            validator.prescriptions(day, phases)
+    return validator.finish()
+
+def validate_program(program):
+    errors = program_errors(program)
+    return (False, "; ".join(errors)) if errors else (True, "Valid program")
+
+class JSONStream:
+    # Reads a JSON document from a file a chunk at a time. members() walks the
+    # object at the cursor key by key; value() decodes the value at the
+    # cursor whole. Only the value being decoded is held in memory.
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        if self.eof:
+            return False
+        data = self.f.read(size)
+        text = data if isinstance(data, str) else self.decoder.decode(data, final=not data)
+        self.eof = not data
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                raise ValueError("Unexpected end of JSON")
+
+    def _expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected {' or '.join(repr(c) for c in chars)} in JSON, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def members(self):
+        # Yields each key; the caller reads its value (value() or members())
+        # before asking for the next one.
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Expected a key in JSON object")
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+def stream_program(f):
+    # Parses a JSON program upload day by day, validating each piece as it
+    # arrives, and stops reading at the first piece with errors. Returns
+    # (program, errors); program is None when there are errors.
+    stream = JSONStream(f)
+    validator = ProgramValidator()
+    program = {}
+    for key in stream.members():
+        if key in ("days", "prescriptions") and stream.peek() == "{":
+            section = program[key] = {}
+            validator.key(key, section)
+            for day in stream.members():
+                section[day] = stream.value()
+                if key == "days":
+                    validator.day(day, section[day])
+                else:
+                    validator.prescriptions(day, section[day])
+                if validator.errors:
+                    return None, validator.errors
+            if key == "days":
+                validator.end_days()
+        else:
+            program[key] = stream.value()
+            validator.key(key, program[key])
+        if validator.errors:
+            return None, validator.errors
+    errors = validator.finish()
+    return (None, errors) if errors else (program, [])
+
+CSV_STRENGTH_FIELDS = ("sets", "reps", "percent_1rm", "rpe", "rest")
+CSV_CONDITIONING_FIELDS = ("duration", "distance", "pace", "rpe", "rest")
+
+def program_from_csv(f, name):
+    # One row per exercise: day, day_description, exercise, schedule
+    # ("0,3"), duration_weeks and description (first row), then
+    # <Phase>_<field> columns. Rows with a Base_duration are conditioning
+    # work (duration/distance/pace), the rest strength (sets/reps/%1RM).
+    # Columns are converted a whole column at a time. Returns (program, errors).
+    import pandas as pd
+    df = pd.read_csv(f, dtype=str, keep_default_na=False)
+    conditioning = df["Base_duration"].str.strip() != "" if "Base_duration" in df else pd.Series(False, index=df.index)
+    required = ["day", "day_description", "exercise", "schedule", "duration_weeks", "description"]
+    for fields, rows in ((CSV_STRENGTH_FIELDS, ~conditioning), (CSV_CONDITIONING_FIELDS, conditioning)):
+        if rows.any():
+            required += [f"{phase}_{field}" for phase in PROGRAM_PHASES for field in fields]
+    missing = [column for column in dict.fromkeys(required) if column not in df]
+    if missing:
+        return None, [f"Missing column: {column}" for column in missing]
+    if df.empty:
+        return None, ["No rows"]
+    errors = []
+
+    days = df.groupby("day", sort=False)
+    first = days[["day_description", "schedule"]].first()
+    weekdays = pd.to_numeric(first["schedule"].str.split(",").explode().str.strip(), errors="coerce")
+    for day in weekdays.index[weekdays.isna()].unique():
+        errors.append(f"Invalid schedule days for {day}")
+    schedules = weekdays.dropna().astype(int).groupby(level=0).agg(list)
+    exercises = days["exercise"].agg(list)
+
+    # any other <Phase>_<field> column (e.g. effort) is carried over as is
+    extra = list(dict.fromkeys(
+        column.split("_", 1)[1] for column in df.columns
+        if column.split("_", 1)[0] in PROGRAM_PHASES and "_" in column and column.split("_", 1)[1] not in CSV_STRENGTH_FIELDS + CSV_CONDITIONING_FIELDS
+    ))
+    columns = {}
+    for phase in PROGRAM_PHASES:
+        for field in dict.fromkeys(CSV_STRENGTH_FIELDS + CSV_CONDITIONING_FIELDS + tuple(extra)):
+            column = df[f"{phase}_{field}"] if f"{phase}_{field}" in df else None
+            if column is None:
+                continue
+            empty = column.str.strip() == ""
+            if field == "rest":
+                rest = pd.to_numeric(column, errors="coerce")
+                bad = ~empty & (rest.isna() | (rest % 1 != 0))
+                for day, exercise in zip(df["day"][bad], df["exercise"][bad]):
+                    errors.append(f"Invalid rest for {exercise} in {day} ({phase})")
+                column = pd.Series(rest.where(~bad, 0).fillna(0).astype(int).tolist(), index=df.index, dtype=object)
+            elif field == "percent_1rm":
+                bounds = column.str.split("-", n=1, expand=True).reindex(columns=[0, 1])
+                low, high = pd.to_numeric(bounds[0], errors="coerce"), pd.to_numeric(bounds[1], errors="coerce")
+                pairs = pd.Series(list(zip(low.tolist(), high.tolist())), index=df.index, dtype=object)
+                # text that isn't a pair stays as text for the validator to report
+                column = pairs.where(low.notna() & high.notna(), column)
+            # an empty cell leaves the field out
+            columns[phase, field] = column.where(~empty, None)
+
+    prescriptions = {day: {phase: {} for phase in PROGRAM_PHASES} for day in exercises.index}
+    for phase in PROGRAM_PHASES:
+        for fields, rows in ((CSV_STRENGTH_FIELDS, ~conditioning), (CSV_CONDITIONING_FIELDS, conditioning)):
+            if not rows.any():
+                continue
+            records = pd.DataFrame({field: columns[phase, field][rows] for field in fields + tuple(extra) if (phase, field) in columns}).to_dict("records")
+            for day, exercise, prescription in zip(df["day"][rows], df["exercise"][rows], records):
+                prescriptions[day][phase][exercise] = {field: value for field, value in prescription.items() if value is not None}
+
+    duration_weeks = pd.to_numeric(df["duration_weeks"].iloc[0], errors="coerce")
+    if pd.isna(duration_weeks) or duration_weeks % 1 != 0:
+        errors.append("Invalid duration_weeks")
+    program = {
+        "name": name,
+        "duration_weeks": 0 if pd.isna(duration_weeks) else int(duration_weeks),
+        "description": df["description"].iloc[0],
+        "days": {
+            day: {"description": first.at[day, "day_description"], "exercises": exercises[day], "schedule": schedules.get(day, [])}
+            for day in exercises.index
+        },
+        "prescriptions": prescriptions,
+    }
+    errors += program_errors(program)
+    return (None, errors) if errors else (program, [])
+
+def read_program_file(filename, f):
+    # (program, errors) from a .json or .csv program file; a CSV program is named after its file
+    if filename.lower().endswith(".json"):
+        return stream_program(f)
+    return program_from_csv(f, os.path.splitext(os.path.basename(filename))[0])
+
+def _program_files(filename, f):
+    # the file itself, or the .json/.csv files inside a zip
+    if not filename.lower().endswith(".zip"):
+        yield filename, f
+        return
+    with zipfile.ZipFile(f) as archive:
+        for info in archive.infolist():
+            base = os.path.basename(info.filename)
+            if info.is_dir() or base.startswith(".") or info.filename.startswith("__MACOSX/") or not base.lower().endswith((".json", ".csv")):
+                continue
+            with archive.open(info) as member:
+                yield f"{filename}/{info.filename}", member
+
+def import_programs(files):
+    # Imports (filename, file) pairs, zips included, saving every valid
+    # program in one library write. Returns one report row per program file.
+    report, programs = [], []
+    for filename, f in files:
+        try:
+            for name, member in _program_files(filename, f):
+                try:
+                    program, errors = read_program_file(name, member)
+                except Exception as e:
+                    report.append({"File": name, "Program": "", "Status": "Error", "Details": str(e)})
+                    continue
+                if errors:
+                    report.append({"File": name, "Program": "", "Status": "Invalid", "Details": "; ".join(errors)})
+                else:
+                    programs.append(program)
+                    report.append({"File": name, "Program": program["name"], "Status": None, "Details": ""})
+        except zipfile.BadZipFile as e:
+            report.append({"File": filename, "Program": "", "Status": "Error", "Details": str(e)})
+    saved = iter(save_programs(programs))
+    for row in report:
+        if row["Status"] is None:
+            row["Status"] = "Imported" if next(saved) else "Duplicate name"
+    return report
+
+PROGRAM_START = date(2025, 9, 1)
+# Weeks per phase, in order; None runs to the end of the program. Programs can
+# set their own "phases" the same way.
+PHASE_WEEKS = {"Base": 4, "Intensity": 4, "Peaking": None}
+
+def week_phases(program, weeks):
+    # Phase names in order, and the index into them for each (1-based) week.
+    phases = dict(program.get("phases") or PHASE_WEEKS)
+    cutoffs = np.cumsum([float("inf") if weeks is None else weeks for weeks in phases.values()])
+    return list(phases), np.minimum(np.searchsorted(cutoffs, weeks), len(cutoffs) - 1)
+
+class ProgramSchedule:
+    # One row per date of a program run, so looking a date up is an index and
+    # a date range is a slice.
+    def __init__(self, program, start):
+        import pandas as pd
+        self.program = program
+        self.start = start
+        self.length = program["duration_weeks"] * 7
+        self.end = start + timedelta(days=self.length - 1)
+        self.weekdays = {}
+        for day_name, details in program["days"].items():
+            for weekday in details["schedule"]:
+                self.weekdays.setdefault(weekday, day_name)
+        dates = pd.date_range(start, periods=self.length)
+        weeks = np.arange(self.length) // 7 + 1
+        phases, phase = week_phases(program, weeks)
+        workout_day = pd.Series(dates.weekday).map(self.weekdays)
+        self.table = pd.DataFrame({
+            "date": dates.date,
+            "week": weeks,
+            "phase": np.array(phases, dtype=object)[phase],
+            "workout_day": workout_day.astype(object).where(workout_day.notna(), None),
+        })
+        self._rows = list(zip(self.table["workout_day"], self.table["week"].tolist(), self.table["phase"]))
+
+    def is_active(self, day):
+        return 0 <= (day - self.start).days < self.length
+
+    def lookup(self, day):
+        offset = (day - self.start).days
+        if 0 <= offset < self.length:
+            return self._rows[offset]
+        return None, None, None
+
+    def between(self, first, last):
+        lo = max(0, (first - self.start).days)
+        hi = min(self.length, (last - self.start).days + 1)
+        return self.table.iloc[lo:max(lo, hi)]
+
+def program_starts():
+    return file_cache.get((storage.root, "program_starts"), None, storage.paths("state", "program_starts"), lambda: storage.load_state("program_starts") or {})
+
+def program_start(program):
+    start = program_starts().get(program["name"]) or program.get("start_date")
+    return date.fromisoformat(start) if start else PROGRAM_START
+
+def set_program_start(program_name, start):
+    with storage.lock("program_starts"):
+        starts = storage.load_state("program_starts") or {}
+        storage.save_state("program_starts", dict(starts, **{program_name: start.isoformat()}))
+    file_cache.invalidate((storage.root, "program_starts"))
+
+def program_schedule(program, start=None):
+    return program_registry().schedule(program, start or program_start(program))
+
+def generate_calendar(year, month, schedule):
+    cal = calendar.monthcalendar(year, month)[:4]
+    workouts = {day: schedule.weekdays.get(weekday, "") for week in cal for weekday, day in enumerate(week) if day}
+    run = schedule.between(date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]))
+    active = {day.day for day in run["date"]}
+    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    return cal, workouts, active, days
+
+def get_workout_day_and_week(current_date, program, start=None):
+    return program_schedule(program, start).lookup(current_date)
+
+def generate_periodized_program(base_week):
+    program = {"days": {}, "prescriptions": {}}
+    for day_name, day_data in base_week["days"].items():
+        program["days"][day_name] = day_data.copy()
+        program["prescriptions"][day_name] = {
+            "Base": base_week["prescriptions"][day_name]["Base"].copy(),
+            "Intensity": {},
+            "Peaking": {}
+        }
+        for ex in day_data["exercises"]:
+            base_prescription = base_week["prescriptions"][day_name]["Base"].get(ex, {})
+            if not base_prescription:
+                continue
+            base = parse_prescription(base_prescription)
+            intensity = base_prescription.copy()
+            peaking = base_prescription.copy()
+            if "duration" in base_prescription:
+                duration, rpe = base["duration"], base["rpe"]
+                intensity["duration"] = str(duration.replace(duration.low + 10, duration.high + 10))
+                peaking["duration"] = str(duration.replace(duration.low + 20, duration.high + 20))
+                intensity["rpe"] = str(rpe.replace(rpe.low + 1, rpe.high + 1))
+                peaking["rpe"] = str(rpe.replace(rpe.low + 1.5, rpe.high + 1.5))
+                intensity["rest"] = max(30, base_prescription["rest"] - 15)
+                peaking["rest"] = max(30, base_prescription["rest"] - 15)
+            else:
+                sets, reps, rpe, percent_1rm = base["sets"], base["reps"], base["rpe"], base["percent_1rm"]
+                intensity["sets"] = str(sets.replace(max(2, sets.low - 1), max(3, sets.high - 1)))
+                peaking["sets"] = str(sets.replace(max(2, sets.low - 1), max(2, sets.high - 1)))
+                intensity["reps"] = str(reps.replace(max(1, reps.low - round(reps.low * 0.25)), max(1, reps.high - round(reps.high * 0.25))))
+                peaking["reps"] = str(reps.replace(max(1, reps.low - round(reps.low * 0.5)), max(1, reps.high - round(reps.high * 0.5))))
+                intensity["percent_1rm"] = (min(0.95, percent_1rm[0] + 0.1), min(1.0, percent_1rm[1] + 0.1))
+                peaking["percent_1rm"] = (min(0.95, percent_1rm[0] + 0.2), min(1.0, percent_1rm[1] + 0.2))
+                intensity["rpe"] = str(rpe.replace(rpe.low + 1, rpe.high + 1))
+                peaking["rpe"] = str(rpe.replace(rpe.low + 1.5, rpe.high + 1.5))
+                intensity["rest"] = base_prescription["rest"] + 30
+                peaking["rest"] = base_prescription["rest"] + 60
+            program["prescriptions"][day_name]["Intensity"][ex] = intensity
+            program["prescriptions"][day_name]["Peaking"][ex] = peaking
+    return program
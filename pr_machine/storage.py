@@ -0,0 +1,969 @@
+# Storage backends (files or SQLite), the file cache and file locks, and the
+# athlete partitions. `storage` is the backend the current session selected.
+import streamlit as st
+import json
+import os
+import csv
+import hashlib
+import re
+import sys
+import io
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from datetime import datetime, timedelta
+from .diagnostics import diagnostics
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover threads of this process
+    fcntl = None
+
+ACHIEVEMENTS_FILE = "achievements.json"
+
+FILE_CACHE_MAX_ENTRIES = 64
+FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def _file_identity(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+def _approx_size(value):
+    # Deep size of cached values; objects holding containers define __sizeof__.
+    # No DataFrame can exist before pandas is imported, so don't import it here.
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_approx_size(item) for item in value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return sys.getsizeof(value) + sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+class FileCache:
+    # Entries are validated against the (inode, size, mtime) of the files they
+    # were loaded from, so a hit costs a stat() per file and no reads.
+    # Per-athlete data is cached under (storage.root, kind).
+    def __init__(self, max_entries=FILE_CACHE_MAX_ENTRIES, max_bytes=FILE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, key, paths, loader):
+        identity = tuple(_file_identity(path) for path in paths)
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and entry[0] == identity:
+                self._entries.move_to_end((kind, key))
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+        value = loader()
+        size = _approx_size(value)
+        with self._lock:
+            old = self._entries.pop((kind, key), None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._entries[(kind, key)] = (identity, value, size)
+            self.bytes += size
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.stats["evictions"] += 1
+        return value
+
+    def invalidate(self, kind, key=None):
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == kind and (key is None or k[1] == key)]:
+                self.bytes -= self._entries.pop(cache_key)[2]
+                self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self.stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+
+file_cache = FileCache()
+
+def file_cache_stats():
+    return dict(file_cache.stats, entries=len(file_cache._entries), bytes=file_cache.bytes)
+
+class FileLock:
+    # Exclusive lock on "<path>.lock": an RLock orders the threads of this
+    # process (and lets a holder re-enter), flock() orders other processes.
+    def __init__(self, path):
+        self.path = path + ".lock"
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self, blocking=True):
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, 'a')
+                if fcntl is not None:
+                    fcntl.flock(self._file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._lock.release()
+                if blocking:
+                    raise
+                return False
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+file_locks = {}
+
+def file_lock(path):
+    path = os.path.abspath(path)
+    return file_locks.get(path) or file_locks.setdefault(path, FileLock(path))
+
+# Writers replace whole files with os.replace(), so readers never need a lock:
+# they see either the old or the new version, never a half-written one.
+def _temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def atomic_write_json(path, data, indent=4):
+    tmp = _temp_path(path)
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def atomic_write_csv(df, path):
+    tmp = _temp_path(path)
+    with open(tmp, 'w', newline='', encoding='utf-8') as f:
+        df.to_csv(f, index=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _complete_lines(data):
+    # An append in progress can leave a partial last line; read up to it.
+    return data[:data.rfind(b"\n") + 1]
+
+ONERM_FILE = "1rm.json"
+ONERM_HISTORY_FILE = "1rm_history.jsonl"
+
+def _backfill_1rm_history(log, onerms, onerms_date):
+    # History for stores that predate it: the 1RM each Workout row was logged
+    # with (only where it changed), then the current values if they differ.
+    import pandas as pd
+    log = log[pd.to_numeric(log["1RM"], errors="coerce") > 0] if "1RM" in log else log.iloc[:0]
+    entries, last = [], {}
+    for day, exercise, value in zip(log["Date"].astype(str), log["Exercise/Note"].astype(str), log["1RM"].astype(float)):
+        if last.get(exercise) != value:
+            entries.append({"date": day, "exercise": exercise, "value": value, "source": "log"})
+            last[exercise] = value
+    for exercise, value in onerms.items():
+        if value and last.get(exercise) != float(value):
+            entries.append({"date": onerms_date, "exercise": exercise, "value": float(value), "source": "entered"})
+    return entries
+
+PERFORMANCE_FILE = "performance_history.json"
+PERFORMANCE_DIR = "performance_history"
+PERFORMANCE_INDEX_FILE = os.path.join(PERFORMANCE_DIR, "exercises.json")
+PERFORMANCE_SUMMARY_FILE = os.path.join(PERFORMANCE_DIR, "summary.json")
+
+def _summarize_performance(summary, exercise, entries):
+    totals = summary.setdefault(exercise, {"total": 0, "successes": 0, "last_date": None})
+    for entry in entries:
+        totals["total"] += 1
+        totals["successes"] += 1 if entry["success"] else 0
+        totals["last_date"] = max(totals["last_date"] or "", entry["date"])
+    return summary
+
+LOG_FILE = "progress_log.csv"
+LOG_TEXT_COLUMNS = ["Date", "Type", "Day", "Exercise/Note", "Details", "Notes"]
+LOG_NUMERIC_COLUMNS = ["Weight", "Calories", "1RM", "Sets Succeeded", "Sets Attempted", "RPE"]
+LOG_COLUMNS = LOG_TEXT_COLUMNS + LOG_NUMERIC_COLUMNS
+
+def parse_log_fields(df):
+    # Back-parses the typed columns from the text older rows were written with.
+    import pandas as pd
+    text = {col: df[col].fillna("").astype(str) if col in df else pd.Series("", index=df.index) for col in LOG_TEXT_COLUMNS}
+    sets = text["Notes"].str.extract(r"(\d+)/(\d+) sets successful")
+    rpe = text["Details"].str.extract(r"RPE (\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?").apply(pd.to_numeric, errors="coerce")
+    return pd.DataFrame({
+        "Weight": pd.to_numeric(text["Exercise/Note"].str.extract(r"Weight: ([^,]*)")[0].str.strip(), errors="coerce"),
+        "Calories": pd.to_numeric(text["Exercise/Note"].str.extract(r"Nutrition: (.*)$")[0].str.strip(), errors="coerce"),
+        "1RM": pd.to_numeric(text["Notes"].str.extract(r"1RM: (\S+)")[0], errors="coerce"),
+        "Sets Succeeded": pd.to_numeric(sets[0], errors="coerce"),
+        "Sets Attempted": pd.to_numeric(sets[1], errors="coerce"),
+        "RPE": rpe.max(axis=1),
+    }, index=df.index)
+
+def _date_key(value):
+    return value.isoformat()[:10] if hasattr(value, "isoformat") else str(value)[:10]
+
+def _filter_log(df, filter_by="", start=None, end=None, columns=None):
+    import pandas as pd
+    if filter_by:
+        df = df[df['Exercise/Note'].str.contains(filter_by, case=False, na=False)]
+    if start is not None or end is not None:
+        day = df["Date"].astype(str).str[:10]
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= day >= _date_key(start)
+        if end is not None:
+            mask &= day <= _date_key(end)
+        df = df[mask]
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+LOG_SNAPSHOT_DIR = "progress_log_snapshot"
+LOG_SNAPSHOT_MANIFEST = os.path.join(LOG_SNAPSHOT_DIR, "manifest.json")
+LOG_COMPACT_TAIL_BYTES = 256 * 1024
+LOG_COMPACT_BACKOFF = 30
+LOG_COMPACT_MAX_BACKOFF = 3600
+
+def _file_slug(name):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+    return f"{slug}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+class FileStorage:
+    # Every write goes through a file_lock() on the file it changes and either
+    # appends whole lines or replaces the file atomically. All files live under
+    # root, one directory per athlete ("" keeps the single-lifter layout).
+    def __init__(self, root=""):
+        self.root = root
+        if root:
+            os.makedirs(root, exist_ok=True)
+        self.log_file = os.path.join(root, LOG_FILE)
+        self.snapshot_dir = os.path.join(root, LOG_SNAPSHOT_DIR)
+        self.snapshot_manifest = os.path.join(root, LOG_SNAPSHOT_MANIFEST)
+        self.performance_file = os.path.join(root, PERFORMANCE_FILE)
+        self.performance_dir = os.path.join(root, PERFORMANCE_DIR)
+        self.performance_index_file = os.path.join(root, PERFORMANCE_INDEX_FILE)
+        self.performance_summary_file = os.path.join(root, PERFORMANCE_SUMMARY_FILE)
+        self.onerm_file = os.path.join(root, ONERM_FILE)
+        self.onerm_history_file = os.path.join(root, ONERM_HISTORY_FILE)
+        self.achievements_file = os.path.join(root, ACHIEVEMENTS_FILE)
+        self._compaction = {"running": False, "failures": 0, "retry_at": 0.0}
+        self._compaction_lock = threading.Lock()
+
+    def _state_path(self, name):
+        return os.path.join(self.root, f"{name}.json")
+
+    def lock(self, name):
+        return file_lock(os.path.join(self.root, name))
+
+    def paths(self, kind, key=None):
+        if kind == "performance":
+            return [self._performance_path(key)]
+        if kind == "performance_summary":
+            return [self.performance_summary_file]
+        if kind == "state":
+            return [self._state_path(key)]
+        return {"log": [self.log_file], "1rm": [self.onerm_file], "1rm_history": [self.onerm_history_file]}[kind]
+
+    def migrate(self):
+        self.migrate_log_schema()
+        self.migrate_performance_layout()
+        self.migrate_1rm_history()
+
+    def _read_log_header(self):
+        if not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0:
+            return []
+        with open(self.log_file, 'r', newline='', encoding='utf-8') as f:
+            return next(csv.reader([f.readline()]), [])
+
+    def _read_log_csv(self):
+        import pandas as pd
+        with open(self.log_file, 'rb') as f:
+            return pd.read_csv(io.BytesIO(_complete_lines(f.read())))
+
+    def append_log(self, rows):
+        import pandas as pd
+        with file_lock(self.log_file):
+            header = self._read_log_header()
+            if header and any(key not in header for row in rows for key in row):
+                # New columns can't be appended under the old header; rewrite once.
+                atomic_write_csv(pd.concat([pd.read_csv(self.log_file), pd.DataFrame(rows)], ignore_index=True), self.log_file)
+                return
+            columns = header or list(dict.fromkeys(key for row in rows for key in row))
+            chunk = pd.DataFrame(rows, columns=columns).to_csv(index=False, header=not header)
+            with open(self.log_file, 'a+b') as f:
+                if header:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        chunk = "\n" + chunk
+                f.write(chunk.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def migrate_log_schema(self):
+        import pandas as pd
+        with file_lock(self.log_file):
+            header = self._read_log_header()
+            missing = [col for col in LOG_NUMERIC_COLUMNS if col not in header]
+            if not header or not missing:
+                return False
+            df = pd.read_csv(self.log_file)
+            atomic_write_csv(df.join(parse_log_fields(df)[missing]), self.log_file)
+        return True
+
+    def load_log(self, filter_by="", start=None, end=None, columns=None):
+        import pandas as pd
+        if not os.path.exists(self.log_file):
+            return pd.DataFrame(columns=columns or LOG_COLUMNS)
+        manifest = self._snapshot_manifest()
+        df = None
+        if manifest is not None:
+            try:
+                df = self._read_snapshot(manifest, filter_by, start, end, columns)
+            except (OSError, ValueError):
+                df = None
+        if df is None:
+            df = self._read_log_csv()
+        if os.path.getsize(self.log_file) - (manifest["offset"] if manifest else 0) >= LOG_COMPACT_TAIL_BYTES:
+            self._start_compaction()
+        if filter_by or start is not None or end is not None or columns is not None:
+            df = _filter_log(df, filter_by, start, end, columns)
+        return df
+
+    # Columnar snapshot: progress_log.csv stays the append-only source of truth.
+    # Everything before manifest["offset"] is compacted into one parquet file
+    # per month; the bytes after it are the tail segment new rows land in.
+    def _snapshot_manifest(self):
+        if not os.path.exists(self.snapshot_manifest):
+            return None
+        try:
+            with open(self.snapshot_manifest, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("header") != self._read_log_header() or os.path.getsize(self.log_file) < manifest["offset"]:
+            return None
+        return manifest
+
+    def _read_log_tail(self, manifest, usecols=None):
+        import pandas as pd
+        with open(self.log_file, 'rb') as f:
+            header_line = f.readline()
+            f.seek(max(manifest["offset"], len(header_line)))
+            data = header_line + _complete_lines(f.read())
+        dtype = {col: str for col, kind in manifest["dtypes"].items() if kind == "object"}
+        return pd.read_csv(io.BytesIO(data), dtype=dtype, usecols=usecols)
+
+    def _read_snapshot(self, manifest, filter_by, start, end, columns):
+        import pandas as pd
+        needed = None
+        if columns is not None:
+            needed = list(dict.fromkeys(
+                [col for col in columns if col in manifest["header"]]
+                + (["Date"] if start is not None or end is not None else [])
+                + (["Exercise/Note"] if filter_by else [])
+            ))
+        first = _date_key(start)[:7] if start is not None else None
+        last = _date_key(end)[:7] if end is not None else None
+        frames = []
+        for month, name in sorted(manifest["partitions"].items()):
+            if (first or last) and (month == "undated" or (first and month < first) or (last and month > last)):
+                continue
+            frames.append(pd.read_parquet(os.path.join(self.snapshot_dir, name), columns=None if needed is None else needed + ["_row"]))
+        tail = self._read_log_tail(manifest, needed)
+        tail.index = range(manifest["rows"], manifest["rows"] + len(tail))
+        frames = [frame.set_index("_row").rename_axis(None) for frame in frames] + [tail]
+        df = pd.concat(frames).sort_index() if len(frames) > 1 else tail
+        # parquet hands back None for missing strings where read_csv gives NaN
+        return df.where(df.notna(), float("nan"))
+
+    def load_log_rows(self, rows, dates):
+        # Just the log rows numbered `rows` (load_log()'s index), in that order.
+        # Their Date values name the monthly partitions to open; only the
+        # matching rows of those, and of the tail, are materialized.
+        import pandas as pd
+        rows = [int(row) for row in rows]
+        if not rows:
+            return pd.DataFrame(columns=self._read_log_header() or LOG_COLUMNS)
+        manifest = self._snapshot_manifest() if os.path.exists(self.log_file) else None
+        if manifest is not None:
+            try:
+                compacted = [row for row in rows if row < manifest["rows"]]
+                months = {str(day)[:7] if re.match(r"\d{4}-\d{2}", str(day)) else "undated" for row, day in zip(rows, dates) if row < manifest["rows"]}
+                frames = [pd.read_parquet(os.path.join(self.snapshot_dir, manifest["partitions"][month]), filters=[("_row", "in", compacted)]).set_index("_row").rename_axis(None)
+                          for month in sorted(months) if month in manifest["partitions"]]
+                if len(compacted) < len(rows):
+                    tail = self._read_log_tail(manifest)
+                    tail.index = range(manifest["rows"], manifest["rows"] + len(tail))
+                    frames.append(tail.loc[[row for row in rows if row >= manifest["rows"]]])
+                df = pd.concat(frames).loc[rows]
+                return df.where(df.notna(), float("nan"))
+            except (OSError, ValueError, KeyError):
+                pass
+        # no snapshot yet (the log is still small) or it changed under us
+        return self.load_log().loc[rows]
+
+    def _start_compaction(self):
+        # At most one background compaction per storage, backing off after failures.
+        with self._compaction_lock:
+            if self._compaction["running"] or time.monotonic() < self._compaction["retry_at"]:
+                return
+            self._compaction["running"] = True
+        threading.Thread(target=self._compact_in_background, daemon=True).start()
+
+    def _compact_in_background(self):
+        # The backoff state is shared with _start_compaction(); only touch it under the lock.
+        error = None
+        try:
+            self.compact_log()
+        except Exception as e:
+            error = e
+        with self._compaction_lock:
+            if error is None:
+                self._compaction["failures"] = 0
+            else:
+                failures = self._compaction["failures"] = self._compaction["failures"] + 1
+                self._compaction["retry_at"] = time.monotonic() + min(LOG_COMPACT_MAX_BACKOFF, LOG_COMPACT_BACKOFF * 2 ** (failures - 1))
+            self._compaction["running"] = False
+        if error is not None:
+            diagnostics.event(f"Log compaction failed ({failures} in a row): {error}")
+
+    def compact_log(self):
+        # One compactor at a time across processes; the others just skip.
+        import pandas as pd
+        lock = file_lock(self.snapshot_dir)
+        if not os.path.exists(self.log_file) or not lock.acquire(blocking=False):
+            return False
+        try:
+            manifest = self._snapshot_manifest()
+            header = self._read_log_header()
+            if manifest is None:
+                manifest = {"offset": 0, "rows": 0, "generation": 0, "partitions": {}, "dtypes": {}}
+            with open(self.log_file, 'rb') as f:
+                header_line = f.readline()
+                f.seek(max(manifest["offset"], len(header_line)))
+                data = _complete_lines(f.read())
+            if not data:
+                return False
+            dtype = {col: str for col, kind in manifest["dtypes"].items() if kind == "object"}
+            tail = pd.read_csv(io.BytesIO(header_line + data), dtype=dtype)
+            tail["_row"] = range(manifest["rows"], manifest["rows"] + len(tail))
+            dates = tail["Date"].astype(str)
+            months = dates.str[:7].where(dates.str.match(r"\d{4}-\d{2}"), "undated")
+            generation = manifest["generation"] + 1
+            partitions = dict(manifest["partitions"])
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            for month, rows in tail.groupby(months):
+                if month in partitions:
+                    rows = pd.concat([pd.read_parquet(os.path.join(self.snapshot_dir, partitions[month])), rows], ignore_index=True)
+                name = f"{month}.g{generation}.parquet"
+                rows.to_parquet(os.path.join(self.snapshot_dir, name), index=False)
+                partitions[month] = name
+            new_manifest = {
+                "offset": max(manifest["offset"], len(header_line)) + len(data),
+                "rows": manifest["rows"] + len(tail),
+                "generation": generation,
+                "header": header,
+                "partitions": partitions,
+                "dtypes": {col: str(kind) for col, kind in tail.drop(columns="_row").dtypes.items()},
+            }
+            atomic_write_json(self.snapshot_manifest, new_manifest)
+            live = set(partitions.values()) | {"manifest.json"}
+            for name in os.listdir(self.snapshot_dir):
+                if name not in live:
+                    os.remove(os.path.join(self.snapshot_dir, name))
+            return True
+        finally:
+            lock.release()
+
+    # Performance history lives in one append-only JSON-lines file per
+    # exercise, so reading or writing one exercise never touches the others.
+    def _performance_path(self, exercise):
+        return os.path.join(self.performance_dir, f"{_file_slug(exercise)}.jsonl")
+
+    def performance_exercises(self):
+        if os.path.exists(self.performance_index_file):
+            with open(self.performance_index_file, 'r') as f:
+                return json.load(f)
+        return []
+
+    def append_performance(self, exercise, entries):
+        # The summary is shared by all exercises, so the whole store takes one lock.
+        with file_lock(self.performance_index_file):
+            path = self._performance_path(exercise)
+            is_new = not os.path.exists(path)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+                f.flush()
+                os.fsync(f.fileno())
+            if is_new:
+                exercises = self.performance_exercises()
+                if exercise not in exercises:
+                    atomic_write_json(self.performance_index_file, exercises + [exercise])
+            if os.path.exists(self.performance_summary_file):
+                self._write_performance_summary(_summarize_performance(self.load_performance_summary(), exercise, entries))
+
+    def _write_performance_summary(self, summary):
+        atomic_write_json(self.performance_summary_file, summary)
+
+    def load_performance_summary(self):
+        if os.path.exists(self.performance_summary_file):
+            with open(self.performance_summary_file, 'r') as f:
+                return json.load(f)
+        if not os.path.isdir(self.performance_dir):
+            return {}
+        with file_lock(self.performance_index_file):
+            if os.path.exists(self.performance_summary_file):
+                return self.load_performance_summary()
+            summary = {}
+            for exercise in self.performance_exercises():
+                _summarize_performance(summary, exercise, self.load_performance(exercise))
+            self._write_performance_summary(summary)
+        return summary
+
+    def migrate_performance_layout(self):
+        if os.path.exists(self.performance_index_file):
+            return False
+        os.makedirs(self.performance_dir, exist_ok=True)
+        with file_lock(self.performance_index_file):
+            if os.path.exists(self.performance_index_file):
+                return False
+            if os.path.exists(self.performance_file):
+                with open(self.performance_file, 'r') as f:
+                    history = json.load(f)
+                for exercise, entries in history.items():
+                    self.append_performance(exercise, entries)
+            if not os.path.exists(self.performance_index_file):
+                atomic_write_json(self.performance_index_file, [], indent=None)
+        return True
+
+    def save_performance(self, exercise, date, success, set_number):
+        self.append_performance(exercise, [{"date": date, "success": success, "set": set_number}])
+
+    def load_all_performance(self):
+        if not os.path.exists(self.performance_index_file) and os.path.exists(self.performance_file):
+            with open(self.performance_file, 'r') as f:
+                return json.load(f)
+        return {exercise: self.load_performance(exercise) for exercise in self.performance_exercises()}
+
+    def load_performance(self, exercise):
+        path = self._performance_path(exercise)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb') as f:
+            data = _complete_lines(f.read()).decode('utf-8')
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    # 1rm.json holds the current values; 1rm_history.jsonl gets a dated line
+    # for every change, under the same lock.
+    def save_1rm(self, exercise, onerm, date):
+        with file_lock(self.onerm_file):
+            data = self.load_1rms()
+            data[exercise] = onerm
+            atomic_write_json(self.onerm_file, data)
+            self._append_1rm_history([{"date": date, "exercise": exercise, "value": onerm, "source": "entered"}])
+
+    def _append_1rm_history(self, entries):
+        with open(self.onerm_history_file, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_1rm_history(self):
+        if not os.path.exists(self.onerm_history_file):
+            return []
+        with open(self.onerm_history_file, 'rb') as f:
+            data = _complete_lines(f.read()).decode('utf-8')
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    def migrate_1rm_history(self):
+        import pandas as pd
+        if os.path.exists(self.onerm_history_file):
+            return False
+        with file_lock(self.onerm_file):
+            if os.path.exists(self.onerm_history_file):
+                return False
+            log = self.load_log(columns=["Date", "Exercise/Note", "1RM"]) if os.path.exists(self.log_file) else pd.DataFrame(columns=["Date", "Exercise/Note", "1RM"])
+            onerms_date = datetime.fromtimestamp(os.path.getmtime(self.onerm_file)).strftime("%Y-%m-%d %H:%M") if os.path.exists(self.onerm_file) else None
+            self._append_1rm_history(_backfill_1rm_history(log, self.load_1rms(), onerms_date))
+        return True
+
+    def load_1rms(self):
+        if os.path.exists(self.onerm_file):
+            with open(self.onerm_file, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def save_achievements(self, achievements):
+        atomic_write_json(self.achievements_file, achievements)
+
+    def load_achievements(self):
+        if os.path.exists(self.achievements_file):
+            with open(self.achievements_file, 'r') as f:
+                return json.load(f)
+        return None
+
+    def save_state(self, name, state):
+        atomic_write_json(self._state_path(name), state)
+
+    def load_state(self, name):
+        if os.path.exists(self._state_path(name)):
+            with open(self._state_path(name), 'r') as f:
+                return json.load(f)
+        return None
+
+SQLITE_FILE = os.environ.get("PR_MACHINE_DB", "pr_machine.db")
+SQLITE_LOG_FIELDS = {
+    "Date": "date", "Type": "type", "Day": "day", "Exercise/Note": "exercise_note", "Details": "details", "Notes": "notes",
+    "Weight": "weight", "Calories": "calories", "1RM": "onerm", "Sets Succeeded": "sets_succeeded", "Sets Attempted": "sets_attempted", "RPE": "rpe"
+}
+SQLITE_NUMERIC_TYPES = {"weight": "REAL", "calories": "REAL", "onerm": "REAL", "sets_succeeded": "INTEGER", "sets_attempted": "INTEGER", "rpe": "REAL"}
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log (
+    id INTEGER PRIMARY KEY, date TEXT, type TEXT, day TEXT, exercise_note TEXT, details TEXT, notes TEXT,
+    weight REAL, calories REAL, onerm REAL, sets_succeeded INTEGER, sets_attempted INTEGER, rpe REAL, extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_log_date ON log(date);
+CREATE INDEX IF NOT EXISTS idx_log_type_date ON log(type, date);
+DROP INDEX IF EXISTS idx_log_exercise;
+CREATE INDEX IF NOT EXISTS idx_log_exercise_date ON log(exercise_note COLLATE NOCASE, date);
+CREATE TABLE IF NOT EXISTS performance (
+    id INTEGER PRIMARY KEY, exercise TEXT NOT NULL, date TEXT NOT NULL, success INTEGER NOT NULL, set_number INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_performance_exercise_date ON performance(exercise, date);
+CREATE TABLE IF NOT EXISTS performance_summary (exercise TEXT PRIMARY KEY, total INTEGER NOT NULL, successes INTEGER NOT NULL, last_date TEXT);
+CREATE TRIGGER IF NOT EXISTS performance_summary_insert AFTER INSERT ON performance BEGIN
+    INSERT INTO performance_summary (exercise, total, successes, last_date) VALUES (NEW.exercise, 1, NEW.success, NEW.date)
+    ON CONFLICT(exercise) DO UPDATE SET total = total + 1, successes = successes + NEW.success, last_date = MAX(COALESCE(last_date, ''), NEW.date);
+END;
+CREATE TABLE IF NOT EXISTS onerm (exercise TEXT PRIMARY KEY, value REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS onerm_history (id INTEGER PRIMARY KEY, exercise TEXT NOT NULL, date TEXT NOT NULL, value REAL NOT NULL, source TEXT);
+CREATE INDEX IF NOT EXISTS idx_onerm_history_exercise_date ON onerm_history(exercise, date);
+CREATE TABLE IF NOT EXISTS achievements (name TEXT PRIMARY KEY, unlocked INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def _sql_value(value):
+    if hasattr(value, "item"):
+        value = value.item()
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+class SQLiteStorage:
+    def __init__(self, root="", path=None):
+        self.root = root
+        if root:
+            os.makedirs(root, exist_ok=True)
+        self.path = path or (os.path.join(root, os.path.basename(SQLITE_FILE)) if root else SQLITE_FILE)
+        self._local = threading.local()
+        with self.lock("migrate"):
+            conn = self._conn()
+            with conn:
+                conn.executescript(SQLITE_SCHEMA)
+            self.migrate_from_files()
+
+    def paths(self, kind, key=None):
+        return [self.path, self.path + "-wal"]
+
+    def lock(self, name):
+        # Row writes are already serialized by SQLite; this only guards read-modify-write of state.
+        return file_lock(f"{self.path}.{name}")
+
+    def migrate(self):
+        with self.lock("migrate"):
+            self.migrate_log_schema()
+            self.migrate_performance_summary()
+            self.migrate_1rm_history()
+
+    def migrate_performance_summary(self):
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'performance_summary'").fetchone():
+            return False
+        with conn:
+            conn.execute("DELETE FROM performance_summary")
+            conn.execute("INSERT INTO performance_summary SELECT exercise, COUNT(*), SUM(success), MAX(date) FROM performance GROUP BY exercise")
+            conn.execute("INSERT INTO meta (key, value) VALUES ('performance_summary', ?)", (datetime.now().isoformat(timespec="seconds"),))
+        return True
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def migrate_from_files(self):
+        import pandas as pd
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_files'").fetchone():
+            return False
+        files = FileStorage(self.root)
+        with conn:
+            if os.path.exists(files.log_file):
+                self._insert_log(conn, pd.read_csv(files.log_file).to_dict("records"))
+            conn.executemany(
+                "INSERT INTO performance (exercise, date, success, set_number) VALUES (?, ?, ?, ?)",
+                [(exercise, entry["date"], int(bool(entry["success"])), entry.get("set")) for exercise, entries in files.load_all_performance().items() for entry in entries]
+            )
+            conn.executemany("INSERT OR REPLACE INTO onerm (exercise, value) VALUES (?, ?)", files.load_1rms().items())
+            self._insert_1rm_history(conn, files.load_1rm_history())
+            achievements = files.load_achievements()
+            if achievements:
+                conn.executemany("INSERT OR REPLACE INTO achievements (name, unlocked) VALUES (?, ?)", [(name, int(bool(v))) for name, v in achievements.items()])
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_files', ?)", (datetime.now().isoformat(timespec="seconds"),))
+        return True
+
+    def migrate_log_schema(self):
+        import pandas as pd
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'log_typed_columns'").fetchone():
+            return False
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(log)")}
+        df = pd.read_sql_query("SELECT id, exercise_note, details, notes FROM log", conn).rename(columns={v: k for k, v in SQLITE_LOG_FIELDS.items()})
+        typed = parse_log_fields(df)
+        with conn:
+            for column, kind in SQLITE_NUMERIC_TYPES.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE log ADD COLUMN {column} {kind}")
+            conn.executemany(
+                "UPDATE log SET weight = ?, calories = ?, onerm = ?, sets_succeeded = ?, sets_attempted = ?, rpe = ? WHERE id = ?",
+                [tuple(_sql_value(v) for v in values) + (int(row_id),) for row_id, values in zip(df["id"], typed[LOG_NUMERIC_COLUMNS].itertuples(index=False))]
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('log_typed_columns', ?)", (datetime.now().isoformat(timespec="seconds"),))
+        return True
+
+    def _insert_log(self, conn, rows):
+        records = []
+        for row in rows:
+            extra = {key: _sql_value(value) for key, value in row.items() if key not in SQLITE_LOG_FIELDS}
+            records.append(tuple(_sql_value(row.get(col)) for col in SQLITE_LOG_FIELDS) + (json.dumps(extra) if extra else None,))
+        fields = ", ".join(SQLITE_LOG_FIELDS.values())
+        conn.executemany(f"INSERT INTO log ({fields}, extra) VALUES ({', '.join('?' * (len(SQLITE_LOG_FIELDS) + 1))})", records)
+
+    def append_log(self, rows):
+        conn = self._conn()
+        with conn:
+            self._insert_log(conn, rows)
+
+    def load_log(self, filter_by="", start=None, end=None, columns=None):
+        query = f"SELECT {', '.join(SQLITE_LOG_FIELDS.values())}, extra FROM log"
+        clauses, params = [], []
+        if filter_by:
+            clauses.append("exercise_note LIKE ? ESCAPE '\\'")
+            params.append("%" + filter_by.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(_date_key(start))
+        if end is not None:
+            clauses.append("date < ?")
+            params.append((datetime.strptime(_date_key(end), "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d"))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        return self._log_frame(self._conn().execute(query + " ORDER BY id", params).fetchall(), columns)
+
+    def _log_frame(self, rows, columns=None, index=None):
+        import pandas as pd
+        df = pd.DataFrame([row[:-1] for row in rows], columns=list(SQLITE_LOG_FIELDS), index=index)
+        extras = [json.loads(row[-1]) if row[-1] else {} for row in rows]
+        if any(extras):
+            df = df.join(pd.DataFrame(extras, index=df.index))
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        return df.replace([None, ""], float("nan")).infer_objects()
+
+    def log_page(self, cursor=None, limit=50, newest_first=True, start=None, end=None, types=(), exercise=""):
+        # Keyset paging on (date, id): `cursor` is the (date, id) of the last
+        # row of the previous page, so appended rows never shift a page.
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(_date_key(start))
+        if end is not None:
+            clauses.append("date < ?")
+            params.append((datetime.strptime(_date_key(end), "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d"))
+        if types:
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if exercise:
+            clauses.append("exercise_note = ? COLLATE NOCASE")
+            params.append(exercise)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM log{where}", params).fetchone()[0]
+        if cursor is not None:
+            op = "<" if newest_first else ">"
+            clauses.append(f"(date {op} ? OR (date = ? AND id {op} ?))")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        rows = conn.execute(
+            f"SELECT {', '.join(SQLITE_LOG_FIELDS.values())}, id, extra FROM log{where} ORDER BY date {order}, id {order} LIMIT ?", params + [limit + 1]
+        ).fetchall()
+        page = rows[:limit]
+        df = self._log_frame([row[:-2] + row[-1:] for row in page], index=[row[-2] for row in page])
+        return df, (page[-1][0], page[-1][-2]) if len(rows) > limit else None, total
+
+    def append_performance(self, exercise, entries):
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO performance (exercise, date, success, set_number) VALUES (?, ?, ?, ?)",
+                [(exercise, entry["date"], int(bool(entry["success"])), entry.get("set")) for entry in entries]
+            )
+
+    def save_performance(self, exercise, date, success, set_number):
+        self.append_performance(exercise, [{"date": date, "success": success, "set": set_number}])
+
+    def load_performance_summary(self):
+        rows = self._conn().execute("SELECT exercise, total, successes, last_date FROM performance_summary")
+        return {exercise: {"total": total, "successes": successes, "last_date": last_date} for exercise, total, successes, last_date in rows}
+
+    def load_performance(self, exercise):
+        rows = self._conn().execute("SELECT date, success, set_number FROM performance WHERE exercise = ? ORDER BY id", (exercise,))
+        return [{"date": d, "success": bool(ok), "set": n} for d, ok, n in rows]
+
+    def save_1rm(self, exercise, onerm, date):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO onerm (exercise, value) VALUES (?, ?)", (exercise, onerm))
+            self._insert_1rm_history(conn, [{"date": date, "exercise": exercise, "value": onerm, "source": "entered"}])
+
+    def _insert_1rm_history(self, conn, entries):
+        conn.executemany(
+            "INSERT INTO onerm_history (exercise, date, value, source) VALUES (?, ?, ?, ?)",
+            [(entry["exercise"], entry["date"], entry["value"], entry.get("source")) for entry in entries]
+        )
+
+    def load_1rm_history(self):
+        rows = self._conn().execute("SELECT date, exercise, value, source FROM onerm_history ORDER BY id")
+        return [{"date": d, "exercise": exercise, "value": value, "source": source} for d, exercise, value, source in rows]
+
+    def migrate_1rm_history(self):
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'onerm_history'").fetchone():
+            return False
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with conn:
+            if not conn.execute("SELECT 1 FROM onerm_history LIMIT 1").fetchone():
+                log = self.load_log(columns=["Date", "Exercise/Note", "1RM"])
+                self._insert_1rm_history(conn, _backfill_1rm_history(log, self.load_1rms(), now))
+            conn.execute("INSERT INTO meta (key, value) VALUES ('onerm_history', ?)", (now,))
+        return True
+
+    def load_1rms(self):
+        return dict(self._conn().execute("SELECT exercise, value FROM onerm"))
+
+    def save_achievements(self, achievements):
+        conn = self._conn()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO achievements (name, unlocked) VALUES (?, ?)", [(name, int(bool(v))) for name, v in achievements.items()])
+
+    def load_achievements(self):
+        rows = self._conn().execute("SELECT name, unlocked FROM achievements").fetchall()
+        return {name: bool(unlocked) for name, unlocked in rows} if rows else None
+
+    def save_state(self, name, state):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (name, json.dumps(state)))
+
+    def load_state(self, name):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+# Each athlete gets a private partition (log, performance, 1RMs, achievements,
+# derived state) under athletes/; the program library stays shared.
+ATHLETES_DIR = "athletes"
+ATHLETES_INDEX_FILE = os.path.join(ATHLETES_DIR, "athletes.json")
+DEFAULT_ATHLETE = "Default"
+
+def athlete_root(athlete):
+    # the default athlete keeps the original files in the working directory
+    return "" if athlete == DEFAULT_ATHLETE else os.path.join(ATHLETES_DIR, _file_slug(athlete))
+
+def _read_athletes():
+    if os.path.exists(ATHLETES_INDEX_FILE):
+        with open(ATHLETES_INDEX_FILE, 'r') as f:
+            return json.load(f)
+    return []
+
+def list_athletes():
+    return [DEFAULT_ATHLETE] + [name for name in file_cache.get("athletes", None, [ATHLETES_INDEX_FILE], _read_athletes) if name != DEFAULT_ATHLETE]
+
+def add_athlete(name):
+    os.makedirs(ATHLETES_DIR, exist_ok=True)
+    with file_lock(ATHLETES_INDEX_FILE):
+        athletes = _read_athletes()
+        if name == DEFAULT_ATHLETE or name in athletes:
+            return False
+        atomic_write_json(ATHLETES_INDEX_FILE, athletes + [name])
+    file_cache.invalidate("athletes")
+    return True
+
+STORAGE_BACKENDS = {"files": FileStorage, "sqlite": SQLiteStorage}
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+def make_storage(backend, athlete=DEFAULT_ATHLETE):
+    # one migrated backend per (backend, athlete) for the whole process
+    with _storages_lock:
+        if (backend, athlete) not in _storages:
+            if backend not in STORAGE_BACKENDS:
+                raise ValueError(f"Unknown storage backend: {backend}")
+            backend_storage = STORAGE_BACKENDS[backend](athlete_root(athlete))
+            backend_storage.migrate()
+            _storages[backend, athlete] = backend_storage
+        return _storages[backend, athlete]
+
+def default_storage():
+    athlete = st.session_state.get("athlete", os.environ.get("PR_MACHINE_ATHLETE", DEFAULT_ATHLETE))
+    return make_storage(os.environ.get("PR_MACHINE_STORAGE", "files"), athlete)
+
+class SessionStorage:
+    # Stands in for the backend of the athlete the current session selected.
+    # A session's rerun (and its widget callbacks) run on the session's script
+    # thread, so the choice is kept per thread: the script calls use() at the
+    # top of every rerun, and a thread that hasn't yet gets default_storage().
+    def __init__(self):
+        self._local = threading.local()
+
+    def use(self, backend_storage):
+        self._local.storage = backend_storage
+
+    def current(self):
+        current = getattr(self._local, "storage", None)
+        if current is None:
+            current = self._local.storage = default_storage()
+        return current
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+storage = SessionStorage()
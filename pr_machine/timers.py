@@ -0,0 +1,245 @@
+# The stopwatch and interval timer components, only imported by the workout
+# page.
+import streamlit.components.v1 as components
+
+def format_time(ms):
+    minutes = ms // 60000
+    seconds = (ms % 60000) // 1000
+    milliseconds = ms % 1000
+    return f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+def render_stopwatch(suggested_rest_ms):
+    stopwatch_html = f"""
+    <style>
+        .stopwatch-container {{ background-color: #4A4A4A; padding: 15px; border-radius: 10px; border: 2px solid #8B0000; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3); margin-bottom: 20px; text-align: center; }}
+        .stopwatch-display {{ font-family: 'Courier New', monospace; font-size: 36px; font-weight: bold; color: #FFFFFF; background-color: #333333; padding: 10px; border-radius: 5px; border: 1px solid #C0C0C0; display: inline-block; margin-bottom: 15px; }}
+        .stopwatch-btn {{ background-color: #8B0000; color: #FFFFFF; font-family: 'Impact', sans-serif; font-size: 16px; padding: 8px 16px; margin: 5px; border: none; border-radius: 5px; cursor: pointer; transition: all 0.3s ease; box-shadow: 0 2px 5px rgba(0,0,0,0.2); }}
+        .stopwatch-btn:hover {{ background-color: #A52A2A; transform: scale(1.05); box-shadow: 0 4px 10px rgba(0,0,0,0.3); }}
+        .lap-list {{ color: #C0C0C0; font-family: 'Courier New', monospace; font-size: 14px; text-align: left; margin-top: 10px; max-height: 150px; overflow-y: auto; }}
+        .progress-bar {{ width: 100px; height: 10px; background-color: #4A4A4A; border-radius: 5px; display: inline-block; margin-left: 10px; overflow: hidden; }}
+        .progress-fill {{ height: 100%; border-radius: 5px; background-color: #90EE90; transition: width 0.3s ease; }}
+    </style>
+    <div class="stopwatch-container">
+        <div id="stopwatch-display" class="stopwatch-display">{format_time(suggested_rest_ms)}</div>
+        <div>
+            <button id="start-btn" class="stopwatch-btn">Start</button>
+            <button id="stop-btn" class="stopwatch-btn">Stop</button>
+            <button id="reset-btn" class="stopwatch-btn">Reset</button>
+            <button id="lap-btn" class="stopwatch-btn">Lap</button>
+        </div>
+        <div id="lap-list" class="lap-list"></div>
+    </div>
+    <script>
+        let stopwatchInterval = null;
+        let elapsedTime = 0;
+        let startTime = 0;
+        let isRunning = false;
+        let isCountdown = true;
+        let countdownTime = {suggested_rest_ms};
+        let laps = [];
+
+        const display = document.getElementById('stopwatch-display');
+        const startBtn = document.getElementById('start-btn');
+        const stopBtn = document.getElementById('stop-btn');
+        const resetBtn = document.getElementById('reset-btn');
+        const lapBtn = document.getElementById('lap-btn');
+        const lapList = document.getElementById('lap-list');
+
+        function formatTime(ms) {{
+            const minutes = Math.floor(ms / 60000);
+            const seconds = Math.floor((ms % 60000) / 1000);
+            const milliseconds = ms % 1000;
+            return `${{minutes.toString().padStart(2, '0')}}:${{seconds.toString().padStart(2, '0')}}.${{milliseconds.toString().padStart(3, '0')}}`;
+        }}
+
+        function updateDisplay() {{
+            if (isCountdown && countdownTime > 0) {{
+                display.innerText = formatTime(countdownTime);
+            }} else {{
+                isCountdown = false;
+                display.innerText = formatTime(elapsedTime);
+            }}
+        }}
+
+        function resetCountdown(newTime) {{
+            isRunning = false;
+            clearInterval(stopwatchInterval);
+            elapsedTime = 0;
+            countdownTime = newTime;
+            isCountdown = true;
+            updateDisplay();
+            laps = [];
+            lapList.innerHTML = '';
+        }}
+
+        function startStopwatch() {{
+            if (!isRunning) {{
+                isRunning = true;
+                startBtn.innerText = 'Resume';
+                if (isCountdown) {{
+                    startTime = Date.now();
+                    stopwatchInterval = setInterval(() => {{
+                        const elapsed = Date.now() - startTime;
+                        countdownTime = Math.max(0, countdownTime - elapsed);
+                        if (countdownTime <= 0) {{
+                            isCountdown = false;
+                            elapsedTime = 0;
+                            startTime = Date.now();
+                        }}
+                        updateDisplay();
+                    }}, 10);
+                }} else {{
+                    startTime = Date.now() - elapsedTime;
+                    stopwatchInterval = setInterval(() => {{
+                        elapsedTime = Date.now() - startTime;
+                        updateDisplay();
+                    }}, 10);
+                }}
+            }}
+        }}
+
+        function stopStopwatch() {{
+            if (isRunning) {{
+                isRunning = false;
+                clearInterval(stopwatchInterval);
+                if (isCountdown) {{
+                    countdownTime = Math.max(0, countdownTime - (Date.now() - startTime));
+                }} else {{
+                    elapsedTime = Date.now() - startTime;
+                }}
+                updateDisplay();
+            }}
+        }}
+
+        function resetStopwatch() {{
+            resetCountdown(countdownTime);
+        }}
+
+        function recordLap() {{
+            if (isRunning) {{
+                const time = isCountdown ? countdownTime : elapsedTime;
+                laps.push(formatTime(time));
+                const lapItem = document.createElement('div');
+                lapItem.innerText = `Lap ${{laps.length}}: ${{formatTime(time)}}`;
+                lapList.appendChild(lapItem);
+            }}
+        }}
+
+        startBtn.addEventListener('click', startStopwatch);
+        stopBtn.addEventListener('click', stopStopwatch);
+        resetBtn.addEventListener('click', resetStopwatch);
+        lapBtn.addEventListener('click', recordLap);
+
+        window.addEventListener('message', function(event) {{
+            if (event.data && event.data.type === 'updateRestTime') {{
+                resetCountdown(event.data.newTime);
+            }}
+        }});
+
+        updateDisplay();
+    </script>
+    """
+    components.html(stopwatch_html, height=300)
+
+def render_interval_timer(run_time_ms, walk_time_ms):
+    interval_timer_html = f"""
+    <style>
+        .interval-timer-container {{ background-color: #4A4A4A; padding: 15px; border-radius: 10px; border: 2px solid #8B0000; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3); margin-bottom: 20px; text-align: center; }}
+        .interval-timer-display {{ font-family: 'Courier New', monospace; font-size: 36px; font-weight: bold; color: #FFFFFF; background-color: #333333; padding: 10px; border-radius: 5px; border: 1px solid #C0C0C0; display: inline-block; margin-bottom: 15px; }}
+        .interval-timer-btn {{ background-color: #8B0000; color: #FFFFFF; font-family: 'Impact', sans-serif; font-size: 16px; padding: 8px 16px; margin: 5px; border: none; border-radius: 5px; cursor: pointer; transition: all 0.3s ease; box-shadow: 0 2px 5px rgba(0,0,0,0.2); }}
+        .interval-timer-btn:hover {{ background-color: #A52A2A; transform: scale(1.05); box-shadow: 0 4px 10px rgba(0,0,0,0.3); }}
+        .phase-label {{ font-family: 'Courier New', monospace; font-size: 18px; color: #90EE90; margin-bottom: 10px; }}
+    </style>
+    <div class="interval-timer-container">
+        <div id="phase-label" class="phase-label">Run</div>
+        <div id="interval-timer-display" class="interval-timer-display">{format_time(run_time_ms)}</div>
+        <div>
+            <button id="start-btn" class="interval-timer-btn">Start</button>
+            <button id="stop-btn" class="interval-timer-btn">Stop</button>
+            <button id="reset-btn" class="interval-timer-btn">Reset</button>
+        </div>
+        <div id="cycle-count" style="color: #C0C0C0; font-family: 'Courier New', monospace; font-size: 14px; margin-top: 10px;">Cycle: 1</div>
+    </div>
+    <script>
+        let timerInterval = null;
+        let elapsedTime = 0;
+        let startTime = 0;
+        let isRunning = false;
+        let isRunPhase = true;
+        let runTime = {run_time_ms};
+        let walkTime = {walk_time_ms};
+        let currentTime = runTime;
+        let cycleCount = 1;
+
+        const display = document.getElementById('interval-timer-display');
+        const phaseLabel = document.getElementById('phase-label');
+        const startBtn = document.getElementById('start-btn');
+        const stopBtn = document.getElementById('stop-btn');
+        const resetBtn = document.getElementById('reset-btn');
+        const cycleCountDisplay = document.getElementById('cycle-count');
+
+        function formatTime(ms) {{
+            const minutes = Math.floor(ms / 60000);
+            const seconds = Math.floor((ms % 60000) / 1000);
+            const milliseconds = ms % 1000;
+            return `${{minutes.toString().padStart(2, '0')}}:${{seconds.toString().padStart(2, '0')}}.${{milliseconds.toString().padStart(3, '0')}}`;
+        }}
+
+        function updateDisplay() {{
+            phaseLabel.innerText = isRunPhase ? 'Run' : 'Walk';
+            display.innerText = formatTime(currentTime);
+            cycleCountDisplay.innerText = `Cycle: ${{cycleCount}}`;
+        }}
+
+        function resetTimer() {{
+            isRunning = false;
+            clearInterval(timerInterval);
+            isRunPhase = true;
+            currentTime = runTime;
+            cycleCount = 1;
+            elapsedTime = 0;
+            updateDisplay();
+        }}
+
+        function startTimer() {{
+            if (!isRunning) {{
+                isRunning = true;
+                startBtn.innerText = 'Resume';
+                startTime = Date.now();
+                timerInterval = setInterval(() => {{
+                    const elapsed = Date.now() - startTime;
+                    currentTime = Math.max(0, currentTime - elapsed);
+                    if (currentTime <= 0) {{
+                        isRunPhase = !isRunPhase;
+                        currentTime = isRunPhase ? runTime : walkTime;
+                        if (!isRunPhase) cycleCount++;
+                        startTime = Date.now();
+                    }}
+                    updateDisplay();
+                }}, 10);
+            }}
+        }}
+
+        function stopTimer() {{
+            if (isRunning) {{
+                isRunning = false;
+                clearInterval(timerInterval);
+                currentTime = Math.max(0, currentTime - (Date.now() - startTime));
+                updateDisplay();
+            }}
+        }}
+
+        startBtn.addEventListener('click', startTimer);
+        stopBtn.addEventListener('click', stopTimer);
+        resetBtn.addEventListener('click', resetTimer);
+
+        window.addEventListener('message', function(event) {{
+            if (event.data && event.data.type === 'updateRestTime') {{
+                resetTimer();
+            }}
+        }});
+
+        updateDisplay();
+    </script>
+    """
+    components.html(interval_timer_html, height=300)
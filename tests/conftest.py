@@ -0,0 +1,61 @@
+# Each test gets a fresh data directory: a storage backend rooted in tmp_path,
+# selected for this thread the way the page selects it, and an empty file cache.
+import logging
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+from pr_machine.storage import STORAGE_BACKENDS, file_cache, storage
+
+def open_storage(backend, root):
+    backend_storage = STORAGE_BACKENDS[backend](str(root))
+    backend_storage.migrate()
+    storage.use(backend_storage)
+    file_cache.clear()
+    return backend_storage
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # the program library and program starts live in the working directory
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    storage.use(None)
+    file_cache.clear()
+
+@pytest.fixture(params=["files", "sqlite"])
+def backend(request, data_dir):
+    return open_storage(request.param, data_dir / request.param)
+
+EXERCISES = ["Deadlifts", "Farmer’s Carry", "Sprints", "SSB Back Squat"]
+
+def make_log_rows(count, seed=0, first_day=date(2025, 1, 1)):
+    # Log rows spread over the year with a bit of everything: every entry
+    # type, gaps in the numeric columns, repeated dates, quotes and newlines.
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        logged = datetime.combine(first_day, datetime.min.time()) + timedelta(days=i * 3 // 4, minutes=rng.randrange(1440))
+        kind = rng.choice(["Workout", "Workout", "Other", "Note"])
+        exercise = rng.choice(EXERCISES)
+        weight = rng.randint(100, 300)
+        rows.append({
+            "Date": logged.strftime("%Y-%m-%d %H:%M"), "Type": kind,
+            "Day": rng.choice(["Day 1: Strength & Power", "Day 2: Conditioning & Core", ""]),
+            "Exercise/Note": exercise if kind == "Workout" else f'note "{i}", recovery',
+            "Details": f"3x{rng.randint(3, 8)} @ {weight}-{weight + 10} lbs, RPE {rng.choice(['7', '8', '8-9'])}" if kind == "Workout" else "",
+            "Notes": rng.choice(["Success", "Fail", "line one\nline two", ""]),
+            "Weight": rng.choice([None, round(rng.uniform(170, 190), 1)]),
+            "Calories": rng.choice([None, rng.randint(1800, 3000)]),
+            "1RM": rng.choice([None, None, weight + 50]) if kind == "Workout" else None,
+        })
+    return rows
+
+@pytest.fixture
+def log_rows():
+    return make_log_rows
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pr_machine.charts import daily, downsample, line_chart, lttb
+
+def test_lttb_keeps_short_series_whole():
+    assert list(lttb(np.arange(5), np.arange(5), 10)) == [0, 1, 2, 3, 4]
+    assert list(lttb(np.arange(5), np.arange(5), 2)) == [0, 1, 2, 3, 4]
+
+@pytest.mark.parametrize("n, points", [(10, 3), (1000, 300), (1001, 7), (5000, 4999)])
+def test_lttb_returns_increasing_indices_with_both_ends(n, points):
+    rng = np.random.default_rng(n)
+    keep = lttb(np.cumsum(rng.uniform(0.5, 2, n)), rng.normal(size=n), points)
+    assert len(keep) == points
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert (np.diff(keep) > 0).all()
+
+def test_lttb_keeps_peaks_and_dips():
+    y = np.zeros(1000)
+    y[137], y[612], y[880] = 50, -40, 30
+    keep = lttb(np.arange(1000), y, 20)
+    assert {137, 612, 880} <= set(keep)
+
+def test_lttb_matches_a_reference_implementation():
+    # the textbook loop: bucket i's point maximises the triangle with the
+    # previously kept point and the average of bucket i + 1
+    rng = np.random.default_rng(1)
+    x, y, points = np.arange(500, dtype=float), rng.normal(size=500).cumsum(), 40
+    edges = np.linspace(1, len(x) - 1, points - 1).astype(int)
+    expected, a = [0], 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = edges[i + 2] if i + 2 < len(edges) else len(x)
+        avg_x, avg_y = x[hi:nxt].mean(), y[hi:nxt].mean()
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(lo, hi)]
+        a = lo + int(np.argmax(areas))
+        expected.append(a)
+    expected.append(len(x) - 1)
+    assert list(lttb(x, y, points)) == expected
+
+def test_daily_takes_one_value_per_day():
+    dates = ["2025-01-02 18:00", "2025-01-01 07:00", "2025-01-02 07:00", "not a date", "2025-01-03"]
+    values = [3, 1, 2, 9, None]
+    assert daily(dates, values).to_dict() == {pd.Timestamp("2025-01-01"): 1.0, pd.Timestamp("2025-01-02"): 3.0}
+    assert daily(dates, values, "mean").to_dict() == {pd.Timestamp("2025-01-01"): 1.0, pd.Timestamp("2025-01-02"): 2.5}
+
+def test_downsample_bounds_chart_points():
+    series = pd.Series(np.sin(np.arange(2000) / 50), index=pd.date_range("2020-01-01", periods=2000))
+    assert len(downsample(series, 300)) == 300
+    assert len(downsample(series.iloc[:100], 300)) == 100
+    chart = line_chart({"a": series, "b": series * 2}, "Value", ["#f00", "#00f"], points=50)
+    assert len(chart.data) == 100
@@ -0,0 +1,19 @@
+# benchmarks/stress_concurrent_writes.py at a size that runs in seconds: two
+# processes of two writer threads each, plus a reader per process, then every
+# write must be found and every read must have parsed.
+import os
+import subprocess
+import sys
+
+import pytest
+
+STRESS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "stress_concurrent_writes.py")
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_no_lost_or_torn_writes(backend, tmp_path):
+    result = subprocess.run(
+        [sys.executable, STRESS, "--processes", "2", "--threads", "2", "--writes", "20", "--storage", backend, "--dir", str(tmp_path)],
+        capture_output=True, text=True, timeout=600,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "OK: no lost or torn writes" in result.stdout
@@ -0,0 +1,106 @@
+import contextlib
+
+import pandas as pd
+import pytest
+
+from pr_machine.engine import (LoadPlan, batched_log_writes, format_prescription, load_progress, progress_page,
+                               rebuild_achievement_state, rebuild_recovery_state, recovery_trends, save_log)
+from pr_machine.catalogs import BJJ_PROGRAM
+
+def log(rows, batched=True):
+    with batched_log_writes() if batched else contextlib.nullcontext():
+        for row in rows:
+            save_log(row["Type"], row)
+
+def assert_same_state(incremental, rebuilt):
+    assert incremental.keys() == rebuilt.keys()
+    for key in incremental:
+        if isinstance(incremental[key], dict):
+            assert_same_state(incremental[key], rebuilt[key])
+        elif isinstance(incremental[key], float):
+            assert incremental[key] == pytest.approx(rebuilt[key])
+        else:
+            assert incremental[key] == rebuilt[key], key
+
+def test_incremental_states_match_a_rebuild(backend, log_rows):
+    rows = log_rows(240, seed=7)
+    # the first flush has no state yet and builds it from the log; every row
+    # after that is applied on its own or in batches
+    log(rows[:10], batched=False)
+    log(rows[10:120])
+    log(rows[120:], batched=False)
+    incremental = {name: backend.load_state(name) for name in ("achievement_state", "recovery_state")}
+    assert incremental["achievement_state"]["rows"] == incremental["recovery_state"]["rows"] == 240
+    assert_same_state(incremental["achievement_state"], rebuild_achievement_state())
+    assert_same_state(incremental["recovery_state"], rebuild_recovery_state())
+
+def test_recovery_trends_follow_the_log(backend, log_rows):
+    rows = log_rows(60, seed=8)
+    log(rows)
+    weights = pd.to_numeric(load_progress()["Weight"], errors="coerce").dropna()
+    trends = recovery_trends(today=pd.Timestamp("2025-03-01").to_pydatetime())
+    assert trends["Weight"]["mean"] == pytest.approx(weights.mean())
+
+def all_pages(limit, newest_first=True, **filters):
+    pages, cursor = [], None
+    while True:
+        page, cursor, total = progress_page(cursor, limit, newest_first, **filters)
+        pages.append(page)
+        if cursor is None:
+            return pages, total
+
+def expected_order(filters, newest_first):
+    # the rows progress_page walks: filtered, ordered by (date, row), ties in logging order
+    df = load_progress().reset_index(drop=True)
+    day = df["Date"].astype(str).str[:10]
+    keep = pd.Series(True, index=df.index)
+    if filters.get("start"):
+        keep &= day >= filters["start"]
+    if filters.get("end"):
+        keep &= day <= filters["end"]
+    if filters.get("types"):
+        keep &= df["Type"].isin(filters["types"])
+    if filters.get("exercise"):
+        keep &= df["Exercise/Note"].str.lower() == filters["exercise"].lower()
+    df = df[keep]
+    df = df.assign(_date=df["Date"].astype(str)).sort_values("_date", kind="stable")
+    return (df.iloc[::-1] if newest_first else df).drop(columns="_date")
+
+@pytest.mark.parametrize("newest_first", [True, False])
+@pytest.mark.parametrize("filters", [
+    {},
+    {"types": ("Workout",)},
+    {"exercise": "deadlifts"},
+    {"start": "2025-02-01", "end": "2025-04-30", "types": ("Workout", "Other")},
+    {"start": "2030-01-01"},
+])
+def test_progress_page_cursors_walk_every_row_once(backend, log_rows, filters, newest_first):
+    log(log_rows(230, seed=9))
+    pages, total = all_pages(37, newest_first, **filters)
+    expected = expected_order(filters, newest_first)
+    assert total == len(expected)
+    assert all(len(page) == 37 for page in pages[:-1]) and len(pages[-1]) <= 37
+    walked = pd.concat(pages).reset_index(drop=True)
+    pd.testing.assert_frame_equal(walked[expected.columns], expected.reset_index(drop=True), check_dtype=False)
+
+def test_progress_page_cursor_survives_new_rows(backend, log_rows):
+    rows = log_rows(120, seed=10)
+    log(rows[:100])
+    expected = expected_order({}, True)
+    first, cursor, _ = progress_page(None, 30)
+    # rows logged after the first page was read are newer than it; the cursor
+    # carries on with the rows that were older than that page
+    log(rows[100:])
+    second, _, total = progress_page(cursor, 30)
+    assert total == 120
+    pd.testing.assert_frame_equal(second[expected.columns].reset_index(drop=True), expected.iloc[30:60].reset_index(drop=True), check_dtype=False)
+
+def test_load_plan_leaves_unloaded_work_out():
+    # Sprints has a 1RM on file but its prescriptions have no %1RM
+    onerms = {"Deadlifts": 300, "Sprints": 300, "Power Cleans": 200}
+    plan = LoadPlan(BJJ_PROGRAM, onerms)
+    frame = plan.frame()
+    assert "Sprints" not in set(frame["Exercise"])
+    assert not frame["Low (lbs)"].isna().any()
+    assert "Deadlifts" in set(frame["Exercise"])
+    assert format_prescription({"sets": "3", "reps": "30 sec", "rpe": "7"}, "Plank", 0) == "3x30 sec, RPE 7"
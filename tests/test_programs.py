@@ -0,0 +1,134 @@
+import copy
+import io
+import json
+
+import pytest
+
+from pr_machine.catalogs import BJJ_PROGRAM, DEFAULT_PROGRAM
+from pr_machine.programs import generate_periodized_program, import_programs, load_programs, program_errors, program_from_csv, stream_program
+
+BUILT_IN = [DEFAULT_PROGRAM, BJJ_PROGRAM]
+
+class Trickle(io.RawIOBase):
+    # a file that hands out a few bytes per read, so chunk boundaries fall
+    # inside keys, numbers and multi-byte characters
+    def __init__(self, data, size=7):
+        self.data, self.pos, self.size = data, 0, size
+
+    def read(self, size=-1):
+        chunk = self.data[self.pos:self.pos + self.size]
+        self.pos += len(chunk)
+        return chunk
+
+def strength_program():
+    return {
+        "name": "Test Program",
+        "duration_weeks": 8,
+        "description": "test",
+        "days": {"Day A": {"description": "a", "exercises": ["Squat"], "schedule": [0, 3]}},
+        "prescriptions": {"Day A": {phase: {"Squat": {"sets": "3-4", "reps": "5", "percent_1rm": (0.7, 0.8), "rpe": "7-8", "rest": 120}} for phase in ("Base", "Intensity", "Peaking")}},
+    }
+
+@pytest.mark.parametrize("program", BUILT_IN, ids=lambda program: program["name"])
+def test_built_in_programs_validate_clean(program):
+    assert program_errors(program) == []
+
+def test_generated_program_validates_clean():
+    base = strength_program()
+    base["days"]["Day B"] = {"description": "b", "exercises": ["Sprints"], "schedule": [5]}
+    base["prescriptions"]["Day B"] = {"Base": {"Sprints": {"duration": "20-30 min", "distance": "2 km", "pace": "easy", "rpe": "6-7", "rest": 60}}}
+    program = generate_periodized_program(base)
+    assert program_errors(dict(program, name="Generated", duration_weeks=12, description="g")) == []
+    assert program["prescriptions"]["Day A"]["Peaking"]["Squat"]["sets"] == "2-3"
+    assert program["prescriptions"]["Day B"]["Intensity"]["Sprints"]["duration"] == "30-40 min"
+
+@pytest.mark.parametrize("field, value, error", [
+    ("sets", "three", "Invalid sets for Squat in Day A (Base)"),
+    ("sets", "5-3", "Invalid sets for Squat in Day A (Base)"),
+    ("reps", "", "Invalid reps for Squat in Day A (Base)"),
+    ("rpe", "hard", "Invalid rpe for Squat in Day A (Base)"),
+    ("percent_1rm", "70%", "Invalid percent_1rm for Squat in Day A (Base)"),
+    ("percent_1rm", (0.9, 0.7), "Invalid percent_1rm for Squat in Day A (Base)"),
+])
+def test_malformed_ranges(field, value, error):
+    program = strength_program()
+    program["prescriptions"]["Day A"]["Base"]["Squat"][field] = value
+    assert program_errors(program) == [error]
+
+@pytest.mark.parametrize("schedule", [[7], [-1], ["Monday"], "0,3", [1.5]])
+def test_malformed_schedules(schedule):
+    program = strength_program()
+    program["days"]["Day A"]["schedule"] = schedule
+    assert program_errors(program) == ["Invalid schedule days for Day A"]
+
+def test_structural_errors():
+    program = strength_program()
+    del program["description"]
+    program["prescriptions"]["Day B"] = copy.deepcopy(program["prescriptions"]["Day A"])
+    del program["prescriptions"]["Day A"]["Peaking"]
+    program["prescriptions"]["Day A"]["Base"]["Lunge"] = {"sets": "3", "reps": "8", "rest": 60}
+    del program["prescriptions"]["Day A"]["Intensity"]["Squat"]["rest"]
+    assert program_errors(program) == [
+        "Missing key: description",
+        "Exercise Lunge not in Day A exercises (Base)",
+        "Missing rest for Squat in Day A (Intensity)",
+        "Missing phase Peaking for Day A",
+        "Prescription day Day B not in days",
+    ]
+
+CSV_HEADER = "day,day_description,exercise,schedule,duration_weeks,description," + ",".join(f"{phase}_{field}" for phase in ("Base", "Intensity", "Peaking") for field in ("sets", "reps", "percent_1rm", "rpe", "rest"))
+
+def csv_program(schedule="0,3", header=CSV_HEADER):
+    row = f'Day A,a,Squat,"{schedule}",8,test,' + ",".join(["3-4,5,0.7-0.8,7-8,120"] * 3)
+    return io.StringIO(f"{header}\n{row}\n")
+
+def test_csv_program_matches_json_form():
+    program, errors = program_from_csv(csv_program(), "Test Program")
+    assert errors == []
+    assert program == strength_program()
+
+def test_csv_missing_column():
+    header = CSV_HEADER.replace(",Peaking_rest", "")
+    program, errors = program_from_csv(csv_program(header=header), "Test Program")
+    assert program is None
+    assert errors == ["Missing column: Peaking_rest"]
+
+@pytest.mark.parametrize("schedule", ["0,x", "Monday", ""])
+def test_csv_invalid_schedule_days(schedule):
+    program, errors = program_from_csv(csv_program(schedule), "Test Program")
+    assert program is None
+    assert "Invalid schedule days for Day A" in errors
+
+def test_import_report(data_dir):
+    bad = io.StringIO(csv_program().getvalue().replace(",Base_sets", "", 1))
+    report = import_programs([("good.csv", csv_program()), ("bad.csv", bad), ("again.csv", csv_program())])
+    assert [(row["File"], row["Status"]) for row in report] == [("good.csv", "Imported"), ("bad.csv", "Invalid"), ("again.csv", "Imported")]
+    assert report[1]["Details"] == "Missing column: Base_sets"
+    assert {"good", "again"} <= {program["name"] for program in load_programs()}
+
+@pytest.mark.parametrize("program", BUILT_IN, ids=lambda program: program["name"])
+@pytest.mark.parametrize("size", [3, 7, 1 << 16])
+def test_streaming_matches_json_load(program, size):
+    data = json.dumps(program, ensure_ascii=False, indent=4).encode("utf-8")
+    streamed, errors = stream_program(Trickle(data, size))
+    assert errors == []
+    assert streamed == json.loads(data)
+
+def test_streaming_reports_the_same_errors():
+    program = strength_program()
+    program["days"]["Day A"]["schedule"] = [9]
+    data = json.dumps(program).encode("utf-8")
+    streamed, errors = stream_program(Trickle(data))
+    assert streamed is None
+    assert errors == program_errors(json.loads(data))
+
+def test_streaming_rejects_truncated_json():
+    data = json.dumps(strength_program()).encode("utf-8")
+    with pytest.raises(ValueError):
+        stream_program(Trickle(data[:len(data) // 2]))
+
+def test_validation_does_not_modify_the_program():
+    program = strength_program()
+    before = copy.deepcopy(program)
+    program_errors(program)
+    assert program == before
@@ -0,0 +1,113 @@
+import json
+
+import pandas as pd
+import pytest
+
+from conftest import EXERCISES, open_storage
+from pr_machine.engine import (batched_log_writes, load_1rms, load_performance, load_progress, onerm_history,
+                               performance_summary, progress_page, save_1rm, save_log, save_performance)
+from pr_machine.storage import _filter_log
+
+def assert_same_log(actual, expected):
+    # the backends agree on values; dtypes of all-missing columns may differ
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+def record(backend, root, rows):
+    # the same writes through the engine, and everything read back
+    backend_storage = open_storage(backend, root)
+    with batched_log_writes():
+        for row in rows[:150]:
+            save_log(row["Type"], row)
+    for row in rows[150:]:
+        save_log(row["Type"], row)
+    for i, row in enumerate(rows[:80]):
+        save_performance(EXERCISES[i % len(EXERCISES)], row["Date"][:10], i % 3 != 0, i % 4 + 1)
+    for exercise, value in [("Deadlifts", 315), ("Sprints", 1), ("Deadlifts", 335.5)]:
+        save_1rm(exercise, value)
+    pages, cursor = [], None
+    while True:
+        page, cursor, total = progress_page(cursor, 40, types=("Workout",))
+        pages.append(page.reset_index(drop=True))
+        if cursor is None:
+            break
+    return {
+        "log": load_progress(),
+        "filtered": load_progress("dead", start="2025-02-01", end="2025-03-15", columns=["Date", "Exercise/Note", "Weight", "1RM"]),
+        "performance": {exercise: load_performance(exercise) for exercise in EXERCISES},
+        "summary": performance_summary(),
+        "1rms": load_1rms(),
+        "1rm_history": onerm_history("Deadlifts").recorded.drop(columns="Date"),
+        "pages": (pd.concat(pages), total),
+        "states": {name: backend_storage.load_state(name) for name in ("achievement_state", "recovery_state")},
+    }
+
+def test_backends_agree(data_dir, log_rows):
+    rows = log_rows(300)
+    files = record("files", data_dir / "files", rows)
+    sqlite = record("sqlite", data_dir / "sqlite", rows)
+    assert len(files["log"]) == 300
+    assert_same_log(sqlite["log"], files["log"])
+    assert_same_log(sqlite["filtered"], files["filtered"])
+    assert len(files["filtered"]) > 0
+    assert sqlite["performance"] == files["performance"]
+    assert sqlite["summary"] == files["summary"]
+    assert sqlite["1rms"] == files["1rms"] == {"Deadlifts": 335.5, "Sprints": 1.0}
+    assert_same_log(sqlite["1rm_history"], files["1rm_history"])
+    assert_same_log(sqlite["pages"][0], files["pages"][0])
+    assert sqlite["pages"][1] == files["pages"][1]
+    assert json.dumps(sqlite["states"], sort_keys=True) == json.dumps(files["states"], sort_keys=True)
+
+@pytest.fixture
+def file_storage(data_dir):
+    return open_storage("files", data_dir)
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"filter_by": "sprints"},
+    {"start": "2025-03-01", "end": "2025-04-15"},
+    {"start": "2025-03-10"},
+    {"end": "2025-01-20", "columns": ["Date", "Weight"]},
+    {"filter_by": "note", "columns": ["Date", "Exercise/Note", "Notes", "Calories"]},
+])
+def test_snapshot_and_tail_match_plain_csv(file_storage, log_rows, query):
+    rows = log_rows(400, seed=1)
+    file_storage.append_log(rows[:250])
+    assert file_storage.compact_log()
+    file_storage.append_log(rows[250:320])
+    assert file_storage.compact_log()
+    # rows after the last compaction stay in the CSV tail
+    file_storage.append_log(rows[320:])
+    assert file_storage._snapshot_manifest()["rows"] == 320
+    snapshot = file_storage.load_log(**query)
+    plain = _filter_log(file_storage._read_log_csv(), **query)
+    assert len(snapshot) > 0
+    pd.testing.assert_frame_equal(snapshot, plain, check_dtype=False)
+
+def test_snapshot_reads_only_the_partitions_in_range(file_storage, log_rows, monkeypatch):
+    file_storage.append_log(log_rows(400, seed=2))
+    file_storage.compact_log()
+    read = []
+    original = pd.read_parquet
+    monkeypatch.setattr(pd, "read_parquet", lambda path, **kwargs: read.append(path) or original(path, **kwargs))
+    file_storage.load_log(start="2025-03-05", end="2025-03-20")
+    assert [path.rsplit("/", 1)[1].split(".")[0] for path in read] == ["2025-03"]
+
+def test_stale_snapshot_falls_back_to_csv(file_storage, log_rows):
+    file_storage.append_log(log_rows(100, seed=3))
+    file_storage.compact_log()
+    with open(file_storage.snapshot_manifest) as f:
+        manifest = json.load(f)
+    manifest["header"] = manifest["header"][:-1]
+    with open(file_storage.snapshot_manifest, "w") as f:
+        json.dump(manifest, f)
+    assert file_storage._snapshot_manifest() is None
+    pd.testing.assert_frame_equal(file_storage.load_log(), file_storage._read_log_csv())
+
+def test_load_log_rows_matches_full_read(file_storage, log_rows):
+    file_storage.append_log(log_rows(300, seed=4))
+    file_storage.compact_log()
+    file_storage.append_log(log_rows(40, seed=5))
+    full = file_storage.load_log()
+    rows = [339, 0, 150, 301, 299, 12]
+    pd.testing.assert_frame_equal(file_storage.load_log_rows(rows, full["Date"].loc[rows]), full.loc[rows], check_dtype=False)
+    assert file_storage.load_log_rows([], []).empty